@@ -1,29 +1,414 @@
 from fastapi import FastAPI
-from fastapi import Body, Header, Depends
+from fastapi import Body, Header, Depends, HTTPException, Request, Response, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field, model_validator
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Literal, Set, Tuple
 from enum import Enum
-import google.generativeai as genai
+from collections import OrderedDict
+from dataclasses import dataclass
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from pathlib import Path
 import os
 import json
 from datetime import datetime, timedelta
+import asyncio
+import bisect
+import time
+import heapq
 import uuid
 import re
+import hashlib
+import hmac
+import zlib
+import gzip
 import httpx  # HTTP 클라이언트 라이브러리
+import orjson
+
+try:
+    import brotli  # 선택 의존성: 설치된 경우에만 br 인코딩 제공
+except ImportError:
+    brotli = None
 
 BASE_DIR = Path(__file__).parent
 load_dotenv(dotenv_path=BASE_DIR / ".env")
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
 # Spring Boot 서버 URL (환경변수로 설정)
 SPRING_BOOT_URL = os.getenv("SPRING_BOOT_URL", "http://spring-server:8080")
 
-app = FastAPI()
+SPRING_TIMEOUT = float(os.getenv("SPRING_TIMEOUT", "30"))  # Spring Boot 요청 타임아웃 (초)
+
+# Gemini 모델 설정
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "models/gemini-2.0-flash")
+GEMINI_WARMUP = os.getenv("GEMINI_WARMUP", "false").lower() == "true"  # 기동 시 워밍업 호출 여부
+GEMINI_WARMUP_TIMEOUT = float(os.getenv("GEMINI_WARMUP_TIMEOUT", "10"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "90"))  # 생성 요청 타임아웃 (초)
+
+# 서킷 브레이커 설정 (연속 실패 횟수 임계값, 차단 유지 시간)
+GEMINI_BREAKER_FAILURES = int(os.getenv("GEMINI_BREAKER_FAILURES", "5"))
+GEMINI_BREAKER_RECOVERY = float(os.getenv("GEMINI_BREAKER_RECOVERY", "30"))
+SPRING_BREAKER_FAILURES = int(os.getenv("SPRING_BREAKER_FAILURES", "5"))
+SPRING_BREAKER_RECOVERY = float(os.getenv("SPRING_BREAKER_RECOVERY", "30"))
+BREAKER_HALF_OPEN_CALLS = int(os.getenv("BREAKER_HALF_OPEN_CALLS", "1"))  # half-open 상태의 동시 시험 호출 수
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 외부 호출을 즉시 거부할 때 발생"""
+
+    def __init__(self, name: str, retry_after: int):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"{name} 서버가 일시적으로 응답하지 않아 요청을 차단했습니다. 약 {retry_after}초 후 다시 시도하세요.")
+
+
+class CircuitBreaker:
+    """외부 의존성 호출용 서킷 브레이커
+
+    closed: 정상 호출. 연속 실패가 failure_threshold에 도달하면 open으로 전환.
+    open: recovery_timeout 동안 모든 호출을 CircuitOpenError로 즉시 거부.
+    half_open: 시험 호출(half_open_max_calls개)만 허용. 성공하면 closed, 실패하면 다시 open.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.half_open_calls = 0
+        self.probe_started_at = 0.0
+        self.stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+        self.last_error: Optional[str] = None
+
+    def _retry_after(self, now: float) -> int:
+        return max(1, int(self.opened_at + self.recovery_timeout - now + 0.999))
+
+    def before_call(self) -> None:
+        """호출 전 확인 - 차단 중이면 CircuitOpenError 발생"""
+        now = time.monotonic()
+        if self.state == "open":
+            if now - self.opened_at < self.recovery_timeout:
+                self.stats["rejected"] += 1
+                raise CircuitOpenError(self.name, self._retry_after(now))
+            self.state = "half_open"
+            self.half_open_calls = 0
+        if self.state == "half_open":
+            # 시험 호출이 결과 없이 끝난 경우(취소 등)를 대비해 recovery_timeout이 지나면 새 시험 허용
+            if self.half_open_calls >= self.half_open_max_calls and now - self.probe_started_at < self.recovery_timeout:
+                self.stats["rejected"] += 1
+                raise CircuitOpenError(self.name, max(1, int(self.probe_started_at + self.recovery_timeout - now + 0.999)))
+            if self.half_open_calls >= self.half_open_max_calls:
+                self.half_open_calls = 0
+            self.half_open_calls += 1
+            self.probe_started_at = now
+
+    def record_success(self) -> None:
+        self.stats["successes"] += 1
+        self.consecutive_failures = 0
+        self.state = "closed"
+
+    def record_failure(self, error: object) -> None:
+        self.stats["failures"] += 1
+        self.consecutive_failures += 1
+        self.last_error = str(error)[:200] or type(error).__name__
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.stats["opened"] += 1
+                print(f"[{self.name}] 서킷 open: {self.last_error}")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    async def call(self, make_call):
+        """make_call()이 만든 코루틴을 서킷 브레이커로 감싸 실행 (차단 시 코루틴을 만들지 않음)"""
+        self.before_call()
+        try:
+            result = await make_call()
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self) -> dict:
+        """모니터링용 상태"""
+        now = time.monotonic()
+        state = self.state
+        if state == "open" and now - self.opened_at >= self.recovery_timeout:
+            state = "half_open"  # 다음 호출이 시험 호출이 됨
+        return {
+            "state": state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout": self.recovery_timeout,
+            "retry_after": self._retry_after(now) if state == "open" else 0,
+            "last_error": self.last_error,
+            **self.stats,
+        }
+
+
+gemini_breaker = CircuitBreaker("Gemini", GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_RECOVERY, BREAKER_HALF_OPEN_CALLS)
+spring_breaker = CircuitBreaker("Spring Boot", SPRING_BREAKER_FAILURES, SPRING_BREAKER_RECOVERY, BREAKER_HALF_OPEN_CALLS)
+
+_models: Dict[str, object] = {}  # 모델명 -> GenerativeModel (프로세스 당 한 번 생성)
+
+
+def get_model(model_name: str = GEMINI_MODEL_NAME):
+    """재사용 가능한 GenerativeModel 반환
+
+    google.generativeai는 import 비용이 커서 첫 모델 생성 시점까지 import를 미룬다.
+    """
+    model = _models.get(model_name)
+    if model is None:
+        import google.generativeai as genai
+
+        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+        model = genai.GenerativeModel(model_name)
+        _models[model_name] = model
+    return model
+
+
+async def prepare_model() -> None:
+    """백그라운드에서 모델 생성 (+ 선택적 워밍업 호출)
+
+    조회 API는 모델 준비를 기다리지 않고 바로 응답할 수 있다.
+    생성 API가 먼저 들어오면 get_model()이 import 완료를 기다린다.
+    """
+    model = await asyncio.to_thread(get_model)
+    if not GEMINI_WARMUP:
+        return
+    try:
+        # 최소 토큰 호출로 Gemini 연결을 미리 맺어 첫 요청 지연을 줄임
+        await asyncio.wait_for(
+            model.generate_content_async("ping", generation_config={"max_output_tokens": 1}),
+            timeout=GEMINI_WARMUP_TIMEOUT,
+        )
+    except Exception as e:
+        print(f"Gemini 워밍업 실패: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 기동 시 디렉토리 준비, 저장 데이터 로드, 모델 준비 (요청 전에 한 번만)"""
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    DATA_DIR.mkdir(exist_ok=True)
+    load_travel_summaries()
+    background_tasks = [asyncio.create_task(prepare_model()), asyncio.create_task(usage_flush_loop())]
+    background_tasks.extend(start_job_workers())
+    if PREGEN_ENABLED:
+        background_tasks.append(asyncio.create_task(pregeneration_loop()))
+    yield
+    for task in background_tasks:
+        if not task.done():
+            task.cancel()
+    usage_tracker.flush()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 security = HTTPBearer(auto_error=False)
 
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """서킷이 열려 있으면 타임아웃을 기다리지 않고 즉시 503 반환"""
+    return ORJSONResponse(
+        status_code=503,
+        content={"success": False, "error": str(exc), "circuit": exc.name, "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(TimeoutError)
+async def upstream_timeout_handler(request: Request, exc: TimeoutError):
+    """Gemini 응답이 GEMINI_TIMEOUT 안에 오지 않은 경우"""
+    return ORJSONResponse(
+        status_code=504,
+        content={"success": False, "error": f"Gemini 응답 시간({GEMINI_TIMEOUT:g}초)을 초과했습니다.", "circuit": gemini_breaker.name},
+    )
+
+
+# 클라이언트별 요청 제한 설정 (토큰 버킷 + 일일 할당량)
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"  # X-Forwarded-For의 마지막(프록시가 추가한) IP 사용
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))  # 상태를 보관하는 최대 클라이언트 수 (LRU)
+RATE_LIMIT_IP_MULTIPLIER = float(os.getenv("RATE_LIMIT_IP_MULTIPLIER", "20"))  # IP 전체 한도 = 사용자 한도 x 배수 (남용 방지용)
+
+
+@dataclass
+class RateLimitPolicy:
+    rate_per_minute: float  # 분당 충전 토큰 수 (0이면 속도 제한 없음)
+    burst: int  # 버킷 크기 (연속 허용 요청 수)
+    daily_quota: int = 0  # 하루 최대 요청 수 (0이면 무제한, 서버 로컬 자정에 초기화)
+
+
+RATE_LIMIT_POLICIES: Dict[str, RateLimitPolicy] = {
+    "generation": RateLimitPolicy(
+        float(os.getenv("GENERATION_RATE_PER_MIN", "5")),
+        int(os.getenv("GENERATION_BURST", "5")),
+        int(os.getenv("GENERATION_DAILY_QUOTA", "50")),
+    ),
+    "feedback": RateLimitPolicy(
+        float(os.getenv("FEEDBACK_RATE_PER_MIN", "10")),
+        int(os.getenv("FEEDBACK_BURST", "10")),
+        int(os.getenv("FEEDBACK_DAILY_QUOTA", "200")),
+    ),
+    "read": RateLimitPolicy(
+        float(os.getenv("READ_RATE_PER_MIN", "120")),
+        int(os.getenv("READ_BURST", "60")),
+    ),
+}
+
+# IP 전체(같은 IP 뒤의 모든 사용자 합산)에 적용하는 느슨한 한도 - 통신사 NAT 등으로 IP를 공유해도
+# 사용자별 한도가 합쳐지지 않도록 일일 할당량 없이 속도만 제한한다.
+RATE_LIMIT_IP_POLICIES: Dict[str, RateLimitPolicy] = {
+    category: RateLimitPolicy(policy.rate_per_minute * RATE_LIMIT_IP_MULTIPLIER, int(policy.burst * RATE_LIMIT_IP_MULTIPLIER))
+    for category, policy in RATE_LIMIT_POLICIES.items()
+}
+
+
+class RateLimitExceeded(Exception):
+    """클라이언트가 속도 제한 또는 일일 할당량을 초과한 경우"""
+
+    def __init__(self, category: str, retry_after: int, quota: bool):
+        self.category = category
+        self.retry_after = retry_after
+        self.quota = quota
+        reason = "오늘 사용 가능한 요청 수를 모두 사용했습니다" if quota else "요청이 너무 많습니다"
+        super().__init__(f"{reason}. 약 {retry_after}초 후 다시 시도하세요.")
+
+
+class RateLimiter:
+    """(클라이언트, 분류)별 토큰 버킷 + 일일 할당량 (요청 당 O(1))
+
+    "ip:"로 시작하는 키는 IP 전체 한도(ip_policies), 나머지 키는 사용자 한도(policies)를 적용한다.
+    상태는 최근 사용 순 OrderedDict에 두고, 최대 개수를 넘으면 가장 오래 쓰지 않은 클라이언트부터 삭제한다.
+    """
+
+    def __init__(self, policies: Dict[str, RateLimitPolicy], ip_policies: Dict[str, RateLimitPolicy], max_clients: int):
+        self.policies = policies
+        self.ip_policies = ip_policies
+        self.max_entries = max_clients * len(policies) * 2  # 클라이언트당 사용자 키 + IP 키
+        self._states: "OrderedDict[Tuple[str, str], list]" = OrderedDict()  # -> [tokens, updated_at, day, used_today]
+        self.stats = {category: {"allowed": 0, "limited": 0, "quota_exceeded": 0} for category in policies}
+
+    def policy_for(self, client: str, category: str) -> RateLimitPolicy:
+        return (self.ip_policies if client.startswith("ip:") else self.policies)[category]
+
+    def _state(self, client: str, category: str, now: float, today: str) -> list:
+        """(클라이언트, 분류) 상태 조회 - 토큰 충전과 날짜 변경에 따른 할당량 초기화까지 반영"""
+        policy = self.policy_for(client, category)
+        key = (client, category)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = [float(policy.burst), now, today, 0]
+            if len(self._states) > self.max_entries:
+                self._states.popitem(last=False)
+        else:
+            self._states.move_to_end(key)
+        if state[2] != today:
+            state[2], state[3] = today, 0
+        if policy.rate_per_minute > 0:
+            state[0] = min(float(policy.burst), state[0] + (now - state[1]) * policy.rate_per_minute / 60)
+        state[1] = now
+        return state
+
+    def check(self, clients: List[str], category: str, cost: int = 1) -> None:
+        """모든 클라이언트 키가 허용되면 각 키의 토큰/할당량을 차감하고, 하나라도 초과면 RateLimitExceeded 발생
+
+        하나라도 거부되면 어느 키에서도 차감하지 않는다.
+        cost가 버킷 크기보다 큰 요청(배치)은 버킷을 가득 채운 상태에서만 허용하고, 할당량은 cost 전체를 차감한다.
+        """
+        now = time.monotonic()
+        today = datetime.now().date().isoformat()
+        checks = []
+        for client in clients:
+            policy = self.policy_for(client, category)
+            checks.append((policy, self._state(client, category, now, today), min(cost, policy.burst)))
+        for policy, state, bucket_cost in checks:
+            if policy.daily_quota and state[3] + cost > policy.daily_quota:
+                self.stats[category]["quota_exceeded"] += 1
+                tomorrow = datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time())
+                raise RateLimitExceeded(category, max(1, int((tomorrow - datetime.now()).total_seconds())), quota=True)
+            if policy.rate_per_minute > 0 and state[0] < bucket_cost:
+                self.stats[category]["limited"] += 1
+                raise RateLimitExceeded(category, max(1, int((bucket_cost - state[0]) * 60 / policy.rate_per_minute + 0.999)), quota=False)
+        for policy, state, bucket_cost in checks:
+            if policy.rate_per_minute > 0:
+                state[0] -= bucket_cost
+            state[3] += cost
+        self.stats[category]["allowed"] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": RATE_LIMIT_ENABLED,
+            "tracked_clients": len(self._states),
+            "policies": {category: vars(policy) for category, policy in self.policies.items()},
+            "ip_policies": {category: vars(policy) for category, policy in self.ip_policies.items()},
+            "stats": self.stats,
+        }
+
+
+rate_limiter = RateLimiter(RATE_LIMIT_POLICIES, RATE_LIMIT_IP_POLICIES, RATE_LIMIT_MAX_CLIENTS)
+
+
+async def client_keys(request: Request, credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)) -> List[str]:
+    """요청 제한 기준 - [IP 전체 키, 사용자 키]
+
+    사용자 키는 Bearer 토큰 해시, 토큰이 없으면 IP("anon:")로 사용자 한도(일일 할당량 포함)를 적용한다.
+    토큰은 여기서 검증하지 않으므로(Spring으로 전달만 함) 매 요청 새 토큰으로 우회할 수 있어,
+    IP 전체 키("ip:")에 느슨한 한도를 항상 함께 적용한다.
+    """
+    host = request.client.host if request.client else "unknown"
+    if RATE_LIMIT_TRUST_PROXY and request.headers.get("x-forwarded-for"):
+        # 앞쪽 항목은 클라이언트가 임의로 넣을 수 있으므로 신뢰하는 프록시가 추가한 마지막 항목 사용
+        host = request.headers["x-forwarded-for"].split(",")[-1].strip()
+    if credentials:
+        user_key = "token:" + hashlib.sha256(credentials.credentials.encode()).hexdigest()[:16]
+    else:
+        user_key = "anon:" + host
+    return ["ip:" + host, user_key]
+
+
+def enforce_rate_limit(clients: List[str], category: str, cost: int = 1) -> None:
+    if RATE_LIMIT_ENABLED:
+        rate_limiter.check(clients, category, cost)
+
+
+def rate_limit(category: str):
+    """엔드포인트별 요청 제한 의존성 - dependencies=[Depends(rate_limit("read"))]"""
+
+    async def dependency(clients: List[str] = Depends(client_keys)) -> List[str]:
+        enforce_rate_limit(clients, category)
+        return clients
+
+    return dependency
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+    return ORJSONResponse(
+        status_code=429,
+        content={"success": False, "error": str(exc), "category": exc.category, "quota": exc.quota, "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+# 관리자 API(/admin/*) 보호 - ADMIN_TOKEN을 설정해야 사용 가능
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(default=None, alias="X-Admin-Token")) -> None:
+    """X-Admin-Token 헤더가 ADMIN_TOKEN과 일치해야 통과 (ADMIN_TOKEN 미설정 시 관리자 API 비활성화)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="관리자 API가 비활성화되어 있습니다. (ADMIN_TOKEN 미설정)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다.")
+
+
+# 토큰 추측 시도도 요청 제한에 걸리도록 요청 제한을 먼저 적용
+ADMIN_DEPENDENCIES = [Depends(rate_limit("read")), Depends(require_admin)]
+
 class TravelStyle(str, Enum):
     ACTIVITY = "체험·액티비티"
     HOTPLACE = "SNS 핫플레이스"
@@ -104,7 +489,9 @@ class TripPlan(BaseModel):
     budget: str = Field(..., max_length=30)  # Spring: length 30
     travelStyles: List[TravelStyle] = Field(..., alias='travel_styles')  # camelCase
     highlights: List[TripHighlight] = []  # 각 항목 100자 이하
-    fullPlan: str = Field(..., alias='full_plan')  # 전체 계획 텍스트
+    fullPlan: str = Field(default="", alias='full_plan')  # 전체 계획 텍스트 (저장소 등록 후에는 블롭으로 분리)
+    fullPlanDigest: Optional[str] = Field(default=None, alias='full_plan_digest')  # 블롭 저장소 키 (sha256)
+    adaptedFrom: Optional[str] = Field(default=None, alias='adapted_from')  # 날짜 조정 재사용 시 원본 travel_id
     dailySchedules: List[DailySchedule] = Field(default=[], alias='daily_schedules')
     outboundTransportation: Optional[TripTransportation] = Field(default=None, alias='outbound_transportation')
     returnTransportation: Optional[TripTransportation] = Field(default=None, alias='return_transportation')
@@ -142,30 +529,355 @@ class TripPlanResponse(BaseModel):
     class Config:
         by_alias = True  # JSON 출력 시 camelCase 사용
 
+
+TRIP_PLAN_RESPONSE_FIELDS = tuple(TripPlanResponse.model_fields)
+
+
+def to_plan_response(plan: TripPlan) -> TripPlanResponse:
+    """저장된 TripPlan을 TripPlanResponse로 변환 (재검증 없이 중첩 객체 재사용)
+
+    TripPlan은 저장 시점에 이미 검증되었으므로 model_construct로 필드만 복사한다.
+    DailySchedule/ScheduleItem 등 중첩 모델 인스턴스는 그대로 공유된다.
+    """
+    return TripPlanResponse.model_construct(
+        **{name: getattr(plan, name) for name in TRIP_PLAN_RESPONSE_FIELDS}
+    )
+
+
+def _orjson_default(obj):
+    """orjson이 직접 처리하지 못하는 pydantic 모델 직렬화"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson 기반 JSON 응답
+
+    엔드포인트에서 이 응답을 직접 반환하면 FastAPI의 jsonable_encoder 단계를 건너뛰고
+    pydantic 모델은 pydantic-core 직렬화기로 바로 인코딩된다.
+    """
+
+    def render(self, content) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # 이 크기(바이트) 이상만 압축
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 확인 (약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding 헤더에서 사용할 압축 방식 선택 (br 우선, 다음 gzip)"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def conditional_json_response(request: Request, etag: str, build_content) -> Response:
+    """ETag 기반 조건부 GET + 압축 협상을 적용한 JSON 응답
+
+    If-None-Match가 일치하면 본문을 만들지 않고 304를 반환한다.
+    build_content는 캐시 미스일 때만 호출된다.
+    """
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = FastJSONResponse(build_content()).body
+    if len(body) >= COMPRESSION_MIN_SIZE:
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        if encoding == "br":
+            body = brotli.compress(body, quality=5)
+            headers["Content-Encoding"] = "br"
+        elif encoding == "gzip":
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
 OUTPUT_DIR = BASE_DIR / "outputs"
-OUTPUT_DIR.mkdir(exist_ok=True)
 
 DATA_DIR = BASE_DIR / "data"
-DATA_DIR.mkdir(exist_ok=True)
 TRAVEL_SUMMARIES_FILE = DATA_DIR / "travel_data.json"
+PLAN_BLOB_DIR = DATA_DIR / "plans"
+PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", "64"))  # 압축 해제된 full_plan LRU 크기
 travel_summaries_store: Dict[str, TripPlan] = {}
+travel_etags: Dict[str, str] = {}  # travel_id -> 저장된 버전의 ETag
+_summaries_etag: Optional[str] = None  # /travel-summaries 전체 목록 ETag (변경 시 무효화)
+
+# 검색용 인덱스 (put_travel_plan / remove_travel_plan에서 함께 갱신)
+destination_index: Dict[str, Set[str]] = {}  # 여행지 -> travel_id 집합
+style_index: Dict[TravelStyle, Set[str]] = {}  # 여행 스타일 -> travel_id 집합
+start_date_index: List[Tuple[str, str]] = []  # (YYYY-MM-DD 시작일, travel_id) 정렬 리스트
+end_date_index: List[Tuple[str, str]] = []  # (YYYY-MM-DD 종료일, travel_id) 정렬 리스트
+
+
+class PlanBlobStore:
+    """full_plan 텍스트용 content-addressed 블롭 저장소
+
+    텍스트는 sha256 다이제스트를 키로 zlib 압축되어 디스크에 저장되고,
+    최근 조회한 텍스트만 작은 LRU 캐시에 압축 해제 상태로 유지한다.
+    """
+
+    def __init__(self, directory: Path, cache_size: int):
+        self.directory = directory
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}.zz"
+
+    def _remember(self, digest: str, text: str) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[digest] = text
+        self._cache.move_to_end(digest)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def put(self, text: str) -> str:
+        """텍스트를 저장하고 다이제스트를 반환 (동일 내용은 한 번만 기록)"""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(zlib.compress(data, 6))
+            tmp_path.replace(path)
+        self._remember(digest, text)
+        return digest
+
+    def get(self, digest: str, cache: bool = True) -> Optional[str]:
+        """다이제스트로 텍스트 조회 (cache=False면 LRU를 건드리지 않음)"""
+        text = self._cache.get(digest)
+        if text is not None:
+            self._cache.move_to_end(digest)
+            return text
+        path = self._path(digest)
+        if not path.exists():
+            return None
+        text = zlib.decompress(path.read_bytes()).decode("utf-8")
+        if cache:
+            self._remember(digest, text)
+        return text
+
+    def prune(self, live_digests: set) -> int:
+        """어떤 여행에서도 참조하지 않는 블롭 삭제"""
+        removed = 0
+        for path in self.directory.glob("*/*.zz"):
+            if path.stem not in live_digests:
+                path.unlink(missing_ok=True)
+                self._cache.pop(path.stem, None)
+                removed += 1
+        return removed
+
+
+plan_blob_store = PlanBlobStore(PLAN_BLOB_DIR, PLAN_CACHE_SIZE)
+
+
+def normalize_date(value: str) -> str:
+    """날짜 문자열을 정렬 가능한 YYYY-MM-DD 형식으로 변환 (YYYY.MM.DD, YYYY/MM/DD 허용)"""
+    value = value.strip().replace(".", "-").replace("/", "-")
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        return value
+
+
+def normalize_destination(value: str) -> str:
+    """여행지 인덱스 키 (앞뒤 공백 제거, 소문자)"""
+    return value.strip().lower()
+
+
+def _index_travel(travel_id: str, plan: TripPlan) -> None:
+    destination_index.setdefault(normalize_destination(plan.destination), set()).add(travel_id)
+    for style in plan.travelStyles:
+        style_index.setdefault(TravelStyle(style), set()).add(travel_id)
+    bisect.insort(start_date_index, (normalize_date(plan.startDate), travel_id))
+    bisect.insort(end_date_index, (normalize_date(plan.endDate), travel_id))
+
+
+def _remove_sorted(index: List[Tuple[str, str]], entry: Tuple[str, str]) -> None:
+    position = bisect.bisect_left(index, entry)
+    if position < len(index) and index[position] == entry:
+        del index[position]
+
+
+def _unindex_travel(travel_id: str, plan: TripPlan) -> None:
+    key = normalize_destination(plan.destination)
+    ids = destination_index.get(key)
+    if ids is not None:
+        ids.discard(travel_id)
+        if not ids:
+            del destination_index[key]
+    for style in plan.travelStyles:
+        ids = style_index.get(TravelStyle(style))
+        if ids is not None:
+            ids.discard(travel_id)
+            if not ids:
+                del style_index[TravelStyle(style)]
+    _remove_sorted(start_date_index, (normalize_date(plan.startDate), travel_id))
+    _remove_sorted(end_date_index, (normalize_date(plan.endDate), travel_id))
+
+
+def put_travel_plan(travel_id: str, plan: TripPlan) -> None:
+    """여행 계획을 저장소에 등록 (full_plan 텍스트는 블롭 저장소로 분리, ETag/검색 인덱스 갱신)"""
+    global _summaries_etag
+    if plan.fullPlan:
+        plan.fullPlanDigest = plan_blob_store.put(plan.fullPlan)
+        plan.fullPlan = ""
+    previous = travel_summaries_store.get(travel_id)
+    if previous is not None:
+        _unindex_travel(travel_id, previous)
+    travel_summaries_store[travel_id] = plan
+    _index_travel(travel_id, plan)
+    travel_etags[travel_id] = 'W/"' + hashlib.sha256(plan.model_dump_json().encode("utf-8")).hexdigest()[:32] + '"'
+    _summaries_etag = None
+
+
+def remove_travel_plan(travel_id: str) -> None:
+    """여행 계획을 저장소에서 제거"""
+    global _summaries_etag
+    plan = travel_summaries_store.pop(travel_id)
+    _unindex_travel(travel_id, plan)
+    travel_etags.pop(travel_id, None)
+    _summaries_etag = None
+
+
+def clear_travel_store() -> None:
+    """저장소와 ETag/검색 인덱스를 모두 비움"""
+    global _summaries_etag
+    travel_summaries_store.clear()
+    travel_etags.clear()
+    destination_index.clear()
+    style_index.clear()
+    start_date_index.clear()
+    end_date_index.clear()
+    _summaries_etag = None
+
+
+def _date_range_ids(index: List[Tuple[str, str]], date_from: Optional[str], date_to: Optional[str]) -> Set[str]:
+    """정렬 인덱스에서 [date_from, date_to] 범위의 travel_id 집합 (이진 탐색)"""
+    low = bisect.bisect_left(index, (date_from,)) if date_from else 0
+    high = bisect.bisect_right(index, (date_to, "\uffff")) if date_to else len(index)
+    return {travel_id for _, travel_id in index[low:high]}
+
+
+def search_travel_ids(
+    destination: Optional[str] = None,
+    styles: Optional[List[TravelStyle]] = None,
+    start_from: Optional[str] = None,
+    start_to: Optional[str] = None,
+    end_from: Optional[str] = None,
+    end_to: Optional[str] = None,
+    sort: str = "start_date",
+    order: str = "asc",
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[List[str], int]:
+    """인덱스 기반 여행 검색 - (정렬된 결과 페이지, 전체 일치 개수) 반환
+
+    조건이 주어진 인덱스 집합만 교집합하고, 조건이 없으면 정렬 인덱스를 그대로 순회한다.
+    """
+    sort_index = start_date_index if sort == "start_date" else end_date_index
+    candidate_sets: List[Set[str]] = []
+    if destination:
+        candidate_sets.append(destination_index.get(normalize_destination(destination), set()))
+    for style in styles or []:
+        candidate_sets.append(style_index.get(style, set()))
+    if start_from or start_to:
+        candidate_sets.append(_date_range_ids(start_date_index, start_from, start_to))
+    if end_from or end_to:
+        candidate_sets.append(_date_range_ids(end_date_index, end_from, end_to))
+
+    if not candidate_sets:
+        if order == "asc":
+            entries = sort_index[offset:offset + limit]
+        else:
+            end = max(len(sort_index) - offset, 0)
+            entries = sort_index[max(end - limit, 0):end][::-1]
+        return [travel_id for _, travel_id in entries], len(sort_index)
+
+    candidate_sets.sort(key=len)
+    matched = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+    date_position = 0 if sort == "start_date" else 1
+
+    def sort_key(travel_id: str) -> Tuple[str, str]:
+        plan = travel_summaries_store[travel_id]
+        return (normalize_date((plan.startDate, plan.endDate)[date_position]), travel_id)
+
+    select = heapq.nsmallest if order == "asc" else heapq.nlargest
+    page = select(offset + limit, matched, key=sort_key)[offset:]
+    return page, len(matched)
+
+
+def get_summaries_etag() -> str:
+    """전체 여행 목록의 ETag (개별 ETag 조합, 변경 전까지 캐시)"""
+    global _summaries_etag
+    if _summaries_etag is None:
+        digest = hashlib.sha256()
+        for travel_id in travel_summaries_store:
+            digest.update(f"{travel_id}:{travel_etags[travel_id]};".encode("utf-8"))
+        _summaries_etag = 'W/"' + digest.hexdigest()[:32] + '"'
+    return _summaries_etag
+
+
+def get_full_plan(plan: TripPlan) -> str:
+    """여행 계획의 전체 텍스트 조회 (블롭 저장소에서 필요할 때만 로드)"""
+    if plan.fullPlanDigest:
+        text = plan_blob_store.get(plan.fullPlanDigest)
+        if text is not None:
+            return text
+    return plan.fullPlan
 
 
 def load_travel_summaries() -> None:
     """파일에서 여행 요약 정보를 로드"""
-    global travel_summaries_store
     if TRAVEL_SUMMARIES_FILE.exists():
         try:
             with open(TRAVEL_SUMMARIES_FILE, 'r', encoding='utf-8') as f:
                 file_data = json.load(f)
                 data_list = file_data.get('data', [])
-                travel_summaries_store = {}
+                clear_travel_store()
+                migrated = False
                 for item in data_list:
                     travel_id = item.pop('id', str(uuid.uuid4()))  # id를 분리하여 키로 사용
-                    travel_summaries_store[travel_id] = TripPlan(**item)
+                    plan = TripPlan(**item)
+                    migrated = migrated or bool(plan.fullPlan)  # 예전 형식: 전체 텍스트가 파일에 포함됨
+                    put_travel_plan(travel_id, plan)
+            if migrated:
+                save_travel_summaries()
+            plan_blob_store.prune({plan.fullPlanDigest for plan in travel_summaries_store.values()})
         except Exception as e:
             print(f"여행 요약 데이터 로드 실패: {e}")
-            travel_summaries_store = {}
+            clear_travel_store()
 
 
 def save_travel_summaries() -> None:
@@ -223,8 +935,219 @@ def parse_budget_to_long(budget_str: str) -> int:
     # 첫 번째 숫자만 사용
     return int(numbers[0]) * 10000
 
+# 계획 본문의 JSON 코드 블록 (닫는 ```가 없는 잘린 블록도 포함)
+PLAN_BLOCK_PATTERN = re.compile(r"```(json|transportation|accommodations)\s*\n(.*?)(?=\n```|\Z)", re.DOTALL)
+PRICE_VALUE_PATTERN = re.compile(r'("(?:price|pricePerNight)"\s*:\s*)"?(\d{1,3}(?:,\d{3})+|\d+)(?:\s*원)?"?')
+TRAILING_COMMA_PATTERN = re.compile(r",(\s*[}\]])")
+TRUNCATION_CUT_ATTEMPTS = 20  # 잘린 JSON을 복구할 때 시도할 최대 절단 위치 수
+
+json_repair_stats = {
+    "blocks_checked": 0,
+    "valid": 0,
+    "local_repaired": 0,
+    "model_repaired": 0,
+    "model_failed": 0,
+    "unrecoverable": 0,
+    "fixes": {"smart_quotes": 0, "trailing_comma": 0, "price": 0, "truncated": 0},
+}
+
+
+def iter_plan_blocks(plan: str, kind: str) -> List[str]:
+    return [match.group(2) for match in PLAN_BLOCK_PATTERN.finditer(plan) if match.group(1) == kind]
+
+
+def _close_truncated_json(prefix: str) -> str:
+    """열린 문자열/괄호를 닫아 잘린 JSON을 완결된 형태로 만듦"""
+    closers = []
+    in_string = escape = False
+    for ch in prefix:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            closers.append("}" if ch == "{" else "]")
+        elif ch in "}]" and closers:
+            closers.pop()
+    if in_string:
+        prefix += '"'
+    return prefix.rstrip().rstrip(",") + "".join(reversed(closers))
+
+
+def _load_truncated_json(text: str):
+    """끝에서부터 완결된 원소(} 또는 ]) 위치로 잘라가며 괄호를 닫아 파싱 - 실패 시 None
+
+    잘린 마지막 원소(필드 일부만 있는 객체)가 남지 않도록 완결된 원소 위치를 먼저 시도하고,
+    완결된 원소가 없을 때만 전체 텍스트를 그대로 닫아 본다.
+    """
+    cuts = [i + 1 for i in range(len(text) - 1, -1, -1) if text[i] in "}]"][:TRUNCATION_CUT_ATTEMPTS] + [len(text)]
+    for cut in cuts:
+        try:
+            return json.loads(TRAILING_COMMA_PATTERN.sub(r"\1", _close_truncated_json(text[:cut])))
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def repair_json_text(text: str, truncated: bool = False) -> Tuple[Optional[object], List[str]]:
+    """JSON 파싱 (실패 시 로컬 수정을 차례로 적용) - (데이터 또는 None, 적용한 수정 목록)
+
+    잘린 JSON 복구(마지막 완결 원소까지 자르기)는 블록이 실제로 잘린 경우에만 적용한다.
+    (truncated=True: 닫는 ```가 없는 블록, 또는 파싱 오류가 입력 끝에서 발생)
+    중간에 문법 오류가 있는 완결된 블록을 잘라내면 뒤쪽 데이터가 사라지므로 None을 반환해 모델 재요청으로 넘긴다.
+    """
+    try:
+        return json.loads(text), []
+    except json.JSONDecodeError:
+        pass
+
+    fixes = []
+    if '"' not in text and "“" in text:
+        text = text.replace("“", '"').replace("”", '"')
+        fixes.append("smart_quotes")
+    fixed = TRAILING_COMMA_PATTERN.sub(r"\1", text)
+    if fixed != text:
+        text = fixed
+        fixes.append("trailing_comma")
+    fixed = PRICE_VALUE_PATTERN.sub(lambda m: m.group(1) + m.group(2).replace(",", ""), text)
+    if fixed != text:
+        text = fixed
+        fixes.append("price")
+    try:
+        return json.loads(text), fixes
+    except json.JSONDecodeError as e:
+        # "Unterminated string"은 닫는 따옴표 없이 입력 끝까지 간 경우
+        at_end = e.pos >= len(text.rstrip()) or e.msg.startswith("Unterminated string")
+    if not (truncated or at_end):
+        return None, fixes
+
+    data = _load_truncated_json(text)
+    return data, fixes + ["truncated"]
+
+
+def clip_to_model(model_cls, item: dict) -> dict:
+    """모델의 max_length를 넘는 문자열 필드를 잘라냄 (Spring 컬럼 길이 초과 방지)"""
+    clipped = dict(item)
+    for name, field in model_cls.model_fields.items():
+        value = clipped.get(name)
+        if not isinstance(value, str):
+            continue
+        for constraint in field.metadata:
+            max_length = getattr(constraint, "max_length", None)
+            if max_length is not None and len(value) > max_length:
+                clipped[name] = value[:max_length]
+    return clipped
+
+
+def build_daily_schedule(day_data: dict, start_date: datetime) -> DailySchedule:
+    """일자별 JSON 하나를 DailySchedule로 변환 (형식이 잘못되면 KeyError/TypeError/ValueError)"""
+    day_num = int(day_data['day'])
+    day_date = (start_date + timedelta(days=day_num-1)).strftime("%Y-%m-%d")  # YYYY-MM-DD 형식
+    
+    schedules = []
+    for idx, item in enumerate(day_data.get('schedules', []), start=1):
+        schedules.append(ScheduleItem(
+            order_index=idx,
+            time=item['time'],
+            title=item['title'][:50],  # 50자 제한
+            description=item['description'][:30]  # 30자 제한
+        ))
+    
+    return DailySchedule(day=day_num, date=day_date, schedules=schedules)
+
+
+def build_transportations(transport_data) -> tuple[Optional[TripTransportation], Optional[TripTransportation]]:
+    """교통편 JSON을 (가는 편, 돌아오는 편)으로 변환"""
+    # 딕셔너리 형식 (편도만)
+    if isinstance(transport_data, dict):
+        return TripTransportation(**clip_to_model(TripTransportation, transport_data)), None
+    # 리스트 형식 (왕복 정보)
+    if not isinstance(transport_data, list):
+        raise TypeError(f"교통편은 리스트 또는 객체여야 합니다: {type(transport_data).__name__}")
+    legs = [TripTransportation(**clip_to_model(TripTransportation, leg)) if isinstance(leg, dict) else None for leg in transport_data[:2]]
+    legs += [None] * (2 - len(legs))
+    return legs[0], legs[1]
+
+
+def build_accommodations(accommodations_data) -> List[TripAccommodation]:
+    if isinstance(accommodations_data, dict):
+        accommodations_data = [accommodations_data]
+    if not isinstance(accommodations_data, list):
+        raise TypeError(f"숙소는 리스트 또는 객체여야 합니다: {type(accommodations_data).__name__}")
+    return [TripAccommodation(**clip_to_model(TripAccommodation, acc_data)) for acc_data in accommodations_data]
+
+
+def validate_timeline_block(data) -> None:
+    for day_data in data if isinstance(data, list) else [data]:
+        build_daily_schedule(day_data, datetime.now())
+
+
+PLAN_BLOCK_VALIDATORS = {
+    "json": validate_timeline_block,
+    "transportation": build_transportations,
+    "accommodations": build_accommodations,
+}
+
+
+PRICE_FIELDS = ("price", "pricePerNight")
+PRICE_TEXT_PATTERN = re.compile(r"\s*(?:약\s*)?(\d[\d,]*(?:\.\d+)?)\s*(만)?\s*원?\s*")
+
+
+def parse_price_text(value: str) -> Optional[int]:
+    """'65,000원', '6.5만원' 같은 가격 문자열을 원 단위 숫자로 변환 (형식이 다르면 None)"""
+    match = PRICE_TEXT_PATTERN.fullmatch(value)
+    if not match:
+        return None
+    amount = float(match.group(1).replace(",", ""))
+    return int(amount * 10000 if match.group(2) else amount)
+
+
+def fix_price_values(data) -> bool:
+    """JSON으로는 올바르지만 가격이 문자열인 값("price": "65,000원")을 숫자로 변환 - 변경 여부 반환"""
+    changed = False
+    for item in data if isinstance(data, list) else [data]:
+        if not isinstance(item, dict):
+            continue
+        for field in PRICE_FIELDS:
+            value = item.get(field)
+            if isinstance(value, str) and (price := parse_price_text(value)) is not None:
+                item[field] = price
+                changed = True
+    return changed
+
+
+def check_plan_block(kind: str, text: str, truncated: bool = False) -> Tuple[Optional[object], List[str], Optional[str]]:
+    """블록 파싱(+로컬 수정) 후 모델 변환까지 검증 - (데이터 또는 None, 적용한 수정, 오류)
+
+    검증에 실패하면 값 수준의 로컬 수정(문자열 가격 → 숫자)을 적용해 한 번 더 검증한다.
+    긴 문자열은 변환 과정에서 모델의 max_length로 잘리므로 검증 실패 원인이 되지 않는다.
+    """
+    data, fixes = repair_json_text(text, truncated)
+    if data is None:
+        return None, fixes, "JSON 파싱 실패"
+    try:
+        PLAN_BLOCK_VALIDATORS[kind](data)
+        return data, fixes, None
+    except (KeyError, TypeError, ValueError) as e:
+        error = f"형식 오류: {e}"
+    if not fix_price_values(data):
+        return None, fixes, error
+    if "price" not in fixes:
+        fixes.append("price")
+    try:
+        PLAN_BLOCK_VALIDATORS[kind](data)
+    except (KeyError, TypeError, ValueError) as e:
+        return None, fixes, f"형식 오류: {e}"
+    return data, fixes, None
+
+
 def extract_timeline_from_plan(plan: str, original_input: TravelInput) -> List[DailySchedule]:
-    """AI가 생성한 JSON 타임라인 추출"""
+    """AI가 생성한 JSON 타임라인 추출 (잘못된 일자는 건너뛰고 나머지 일자는 유지)"""
     daily_schedules = []
     
     try:
@@ -235,108 +1158,57 @@ def extract_timeline_from_plan(plan: str, original_input: TravelInput) -> List[D
         except ValueError:
             start_date = datetime.now()
     
-    # JSON 블록 추출
-    json_pattern = r'```json\s*\n(.*?)\n```'
-    json_matches = re.findall(json_pattern, plan, re.DOTALL)
-    
-    if json_matches:
-        try:
-            for json_str in json_matches:
-                timeline_data = json.loads(json_str)
-                
-                if isinstance(timeline_data, dict) and 'day' in timeline_data:
-                    day_num = timeline_data['day']
-                    day_date = (start_date + timedelta(days=day_num-1)).strftime("%Y.%m.%d")
-                    
-                    schedules = []
-                    for idx, item in enumerate(timeline_data.get('schedules', []), start=1):
-                        schedules.append(ScheduleItem(
-                            order_index=idx,
-                            time=item['time'],
-                            title=item['title'][:50],  # 50자 제한
-                            description=item['description'][:30]  # 30자 제한
-                        ))
-                    
-                    daily_schedules.append(DailySchedule(
-                        day=day_num,
-                        date=day_date.replace(".", "-"),  # YYYY-MM-DD 형식
-                        schedules=schedules
-                    ))
-                
-                elif isinstance(timeline_data, list):
-                    for day_data in timeline_data:
-                        if 'day' in day_data:
-                            day_num = day_data['day']
-                            day_date = (start_date + timedelta(days=day_num-1)).strftime("%Y.%m.%d")
-                            
-                            schedules = []
-                            for idx, item in enumerate(day_data.get('schedules', []), start=1):
-                                schedules.append(ScheduleItem(
-                                    order_index=idx,
-                                    time=item['time'],
-                                    title=item['title'][:50],  # 50자 제한
-                                    description=item['description'][:30]  # 30자 제한
-                                ))
-                            
-                            daily_schedules.append(DailySchedule(
-                                day=day_num,
-                                date=day_date.replace(".", "-"),  # YYYY-MM-DD 형식
-                                schedules=schedules
-                            ))
-        except json.JSONDecodeError as e:
-            print(f"JSON 파싱 오류: {e}")
+    for json_str in iter_plan_blocks(plan, "json"):
+        timeline_data, _ = repair_json_text(json_str)
+        if timeline_data is None:
+            print(f"JSON 파싱 오류: {json_str[:80]!r}")
+            continue
+        
+        for day_data in timeline_data if isinstance(timeline_data, list) else [timeline_data]:
+            if not isinstance(day_data, dict) or 'day' not in day_data:
+                continue
+            try:
+                daily_schedules.append(build_daily_schedule(day_data, start_date))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"{day_data.get('day')}일차 타임라인 처리 오류: {e}")
     
     return daily_schedules
 
 
 def extract_transportations_from_plan(plan: str) -> tuple[Optional[TripTransportation], Optional[TripTransportation]]:
     """AI 생성 계획에서 왕복 교통편 정보 추출 (가는 편, 돌아오는 편)"""
-    outbound = None
-    return_transport = None
-    
-    json_pattern = r'```transportation\s*\n(.*?)\n```'
-    json_matches = re.findall(json_pattern, plan, re.DOTALL)
+    blocks = iter_plan_blocks(plan, "transportation")
+    if not blocks:
+        return None, None
     
-    if json_matches:
-        try:
-            transport_data = json.loads(json_matches[0])
-            
-            # 리스트 형식 (왕복 정보)
-            if isinstance(transport_data, list):
-                if len(transport_data) >= 1 and isinstance(transport_data[0], dict):
-                    outbound = TripTransportation(**transport_data[0])
-                if len(transport_data) >= 2 and isinstance(transport_data[1], dict):
-                    return_transport = TripTransportation(**transport_data[1])
-            # 딕셔너리 형식 (편도만)
-            elif isinstance(transport_data, dict):
-                outbound = TripTransportation(**transport_data)
-                
-        except json.JSONDecodeError as e:
-            print(f"교통편 JSON 파싱 오류: {e}")
-        except Exception as e:
-            print(f"교통편 데이터 처리 오류: {e}")
-    
-    return outbound, return_transport
+    transport_data, _ = repair_json_text(blocks[0])
+    if transport_data is None:
+        print("교통편 JSON 파싱 오류")
+        return None, None
+    fix_price_values(transport_data)
+    try:
+        return build_transportations(transport_data)
+    except Exception as e:
+        print(f"교통편 데이터 처리 오류: {e}")
+        return None, None
 
 
 def extract_accommodations_from_plan(plan: str) -> List[TripAccommodation]:
     """AI 생성 계획에서 숙소 정보 추출"""
-    accommodations = []
-    json_pattern = r'```accommodations\s*\n(.*?)\n```'
-    json_matches = re.findall(json_pattern, plan, re.DOTALL)
+    blocks = iter_plan_blocks(plan, "accommodations")
+    if not blocks:
+        return []
     
-    if json_matches:
-        try:
-            accommodations_data = json.loads(json_matches[0])
-            if isinstance(accommodations_data, list):
-                for acc_data in accommodations_data:
-                    accommodations.append(TripAccommodation(**acc_data))
-            elif isinstance(accommodations_data, dict):
-                accommodations.append(TripAccommodation(**accommodations_data))
-        except json.JSONDecodeError as e:
-            print(f"숙소 JSON 파싱 오류: {e}")
-    
-    return accommodations
+    accommodations_data, _ = repair_json_text(blocks[0])
+    if accommodations_data is None:
+        print("숙소 JSON 파싱 오류")
+        return []
+    fix_price_values(accommodations_data)
+    try:
+        return build_accommodations(accommodations_data)
+    except Exception as e:
+        print(f"숙소 데이터 처리 오류: {e}")
+        return []
 
 
 def extract_summary_from_plan(plan: str, original_input: TravelInput) -> TripPlan:
@@ -411,8 +1283,9 @@ def extract_summary_from_plan(plan: str, original_input: TravelInput) -> TripPla
 
 
 def find_existing_travel(data: TravelInput) -> Optional[str]:
-    """동일한 조건의 기존 여행이 있는지 확인"""
-    for travel_id, travel in travel_summaries_store.items():
+    """동일한 조건의 기존 여행이 있는지 확인 (여행지 인덱스로 후보 축소)"""
+    for travel_id in destination_index.get(normalize_destination(data.destination), ()):
+        travel = travel_summaries_store[travel_id]
         if (travel.destination == data.destination and 
             travel.departure == data.departure and
             travel.startDate == data.start_date and 
@@ -424,6 +1297,124 @@ def find_existing_travel(data: TravelInput) -> Optional[str]:
     return None
 
 
+# 날짜만 다른 동일 여행 재사용 (Gemini 호출 없이 기존 계획의 날짜를 이동)
+DATE_SHIFT_ENABLED = os.getenv("DATE_SHIFT_ENABLED", "true").lower() == "true"
+DATE_SHIFT_MAX_DAYS = int(os.getenv("DATE_SHIFT_MAX_DAYS", "90"))  # 계절 차이를 고려한 최대 이동 일수
+DATE_SHIFT_WINDOW_DAYS = 7  # 여행 기간 앞뒤로 이 범위 안의 날짜만 본문에서 이동
+
+WEEKDAYS_KO = "월화수목금토일"
+NUMERIC_DATE_PATTERN = re.compile(
+    r"(?<!\d)(\d{4})([.\-/])(\d{1,2})\2(\d{1,2})(?!\d)(\s*\(([월화수목금토일])(요일)?\))?"
+)
+KOREAN_DATE_PATTERN = re.compile(r"(?<!\d)(\d{1,2})월\s*(\d{1,2})일(\s*\(([월화수목금토일])(요일)?\))?")
+
+plan_reuse_stats = {
+    "requests": 0,
+    "date_shift_hits": 0,
+    "date_shift_seconds": 0.0,
+    "generations": 0,
+    "generation_seconds": 0.0,
+}
+
+
+def parse_trip_date(value: str) -> Optional[datetime]:
+    """YYYY-MM-DD / YYYY.MM.DD / YYYY/MM/DD 날짜 파싱 (실패 시 None)"""
+    try:
+        return datetime.strptime(normalize_date(value), "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def find_date_shift_candidate(data: TravelInput) -> Optional[Tuple[str, int]]:
+    """시작일만 다른 동일 조건의 여행 검색 - (travel_id, 이동 일수) 반환
+
+    여행 기간 길이와 나머지 조건이 모두 같아야 하며, 이동 거리가 가장 짧은 여행을 고른다.
+    """
+    new_start, new_end = parse_trip_date(data.start_date), parse_trip_date(data.end_date)
+    if new_start is None or new_end is None:
+        return None
+    styles = set(style.value for style in data.style)
+    best: Optional[Tuple[str, int]] = None
+    for travel_id in destination_index.get(normalize_destination(data.destination), ()):
+        travel = travel_summaries_store[travel_id]
+        if (travel.destination != data.destination or
+            travel.departure != data.departure or
+            travel.companions != data.companions or
+            travel.budget != data.budget or
+            set(travel.travelStyles) != styles or
+            not travel.fullPlanDigest):
+            continue
+        old_start, old_end = parse_trip_date(travel.startDate), parse_trip_date(travel.endDate)
+        if old_start is None or old_end is None or old_end - old_start != new_end - new_start:
+            continue
+        delta = (new_start - old_start).days
+        if delta == 0 or abs(delta) > DATE_SHIFT_MAX_DAYS:
+            continue
+        if best is None or abs(delta) < abs(best[1]):
+            best = (travel_id, delta)
+    return best
+
+
+def shift_dates_in_text(text: str, delta_days: int, trip_start: datetime, trip_end: datetime) -> str:
+    """본문의 여행 기간 근처 날짜(숫자형, 'M월 D일')를 delta_days만큼 이동 (요일 표기도 갱신)"""
+    window_start = trip_start - timedelta(days=DATE_SHIFT_WINDOW_DAYS)
+    window_end = trip_end + timedelta(days=DATE_SHIFT_WINDOW_DAYS)
+    shift = timedelta(days=delta_days)
+
+    def weekday_suffix(match_suffix: Optional[str], day_name: Optional[str], long_form: Optional[str], date: datetime) -> str:
+        if not match_suffix:
+            return ""
+        return match_suffix.replace(day_name + (long_form or ""), WEEKDAYS_KO[date.weekday()] + (long_form or ""), 1)
+
+    def replace_numeric(match: re.Match) -> str:
+        year, sep, month, day, suffix, day_name, long_form = match.groups()
+        try:
+            date = datetime(int(year), int(month), int(day))
+        except ValueError:
+            return match.group(0)
+        if not window_start <= date <= window_end:
+            return match.group(0)
+        shifted = date + shift
+        month_text = f"{shifted.month:02d}" if len(month) == 2 else str(shifted.month)
+        day_text = f"{shifted.day:02d}" if len(day) == 2 else str(shifted.day)
+        return f"{shifted.year}{sep}{month_text}{sep}{day_text}" + weekday_suffix(suffix, day_name, long_form, shifted)
+
+    def replace_korean(match: re.Match) -> str:
+        month, day, suffix, day_name, long_form = match.groups()
+        for year in {trip_start.year, trip_end.year}:
+            try:
+                date = datetime(year, int(month), int(day))
+            except ValueError:
+                continue
+            if window_start <= date <= window_end:
+                shifted = date + shift
+                return f"{shifted.month}월 {shifted.day}일" + weekday_suffix(suffix, day_name, long_form, shifted)
+        return match.group(0)
+
+    text = NUMERIC_DATE_PATTERN.sub(replace_numeric, text)
+    return KOREAN_DATE_PATTERN.sub(replace_korean, text)
+
+
+def shift_trip_plan(source_id: str, delta_days: int, data: TravelInput) -> TripPlan:
+    """저장된 여행 계획을 복제해 모든 날짜를 delta_days만큼 이동한 새 계획 생성"""
+    source = travel_summaries_store[source_id]
+    trip_start, trip_end = parse_trip_date(source.startDate), parse_trip_date(source.endDate)
+    shift = timedelta(days=delta_days)
+
+    plan = source.model_copy(deep=True)
+    plan.startDate = data.start_date
+    plan.endDate = data.end_date
+    plan.title = shift_dates_in_text(plan.title, delta_days, trip_start, trip_end)
+    for daily in plan.dailySchedules:
+        day_date = parse_trip_date(daily.date)
+        if day_date is not None:
+            daily.date = (day_date + shift).strftime("%Y-%m-%d")
+    plan.fullPlan = shift_dates_in_text(get_full_plan(source), delta_days, trip_start, trip_end)
+    plan.fullPlanDigest = None
+    plan.adaptedFrom = source_id
+    return plan
+
+
 example_prompt = """
 [출력 예시]
 
@@ -460,15 +1451,12 @@ example_prompt = """
 """
 
 latest_plan = None
+latest_travel_id: Optional[str] = None  # latest_plan에 해당하는 여행 ID (피드백 토큰 집계용)
 chat_history: list[str] = []
 
-load_travel_summaries()
-@app.post("/Travel-Plan")
-async def create_travel_plan(data: TravelInput = Body(...)):
-    global latest_plan, chat_history
-    chat_history = []
-
-    prompt = f"""
+def build_travel_prompt(data: TravelInput) -> str:
+    """여행 일정 생성 프롬프트 구성"""
+    return f"""
 당신은 전문 여행 플래너이자 컨시어지입니다.  
 아래 사용자의 여행 정보를 바탕으로 실제 존재하는 장소, 숙소, 맛집을 포함한 여행 일정을 작성하고,  
 상단에는 카드 형태로 표현할 수 있는 요약 정보(하이라이트)를 함께 생성하세요.
@@ -627,78 +1615,928 @@ async def create_travel_plan(data: TravelInput = Body(...)):
 """
 
 
+# Gemini 토큰 사용량/비용 집계
+GEMINI_INPUT_PRICE_PER_1M = float(os.getenv("GEMINI_INPUT_PRICE_PER_1M", "0.10"))  # 입력 100만 토큰 당 USD
+GEMINI_OUTPUT_PRICE_PER_1M = float(os.getenv("GEMINI_OUTPUT_PRICE_PER_1M", "0.40"))  # 출력 100만 토큰 당 USD
+USAGE_FLUSH_INTERVAL = int(os.getenv("USAGE_FLUSH_INTERVAL", "60"))  # 사용량 로그 기록 주기 (초)
+USAGE_MAX_TRIPS = int(os.getenv("USAGE_MAX_TRIPS", "10000"))  # 여행별 집계 최대 보관 수
+USAGE_LOG_FILE = DATA_DIR / "usage_log.jsonl"
 
-    model = genai.GenerativeModel("models/gemini-2.0-flash")
-    response = model.generate_content(prompt)
-    
-    latest_plan = response.text
-    save_plan_to_file(latest_plan)
-    
-    existing_travel_id = find_existing_travel(data)
-    
-    if existing_travel_id:
-        existing_travel = travel_summaries_store[existing_travel_id]
-        
-        updated_summary = extract_summary_from_plan(latest_plan, data)
-        
-        travel_summaries_store[existing_travel_id] = updated_summary
-        save_travel_summaries()
-        
-        # 사용자에게는 JSON 블록 없이 깨끗한 텍스트만 전달
-        clean_plan = remove_json_blocks(latest_plan)
-        
-        return {
-            "plan": clean_plan,
-            "travel_id": existing_travel_id,
-            "message": "기존 여행 계획이 업데이트되었습니다.",
-            "summary": TripPlanResponse(
-                title=updated_summary.title,
-                destination=updated_summary.destination,
-                departure=updated_summary.departure,
-                startDate=updated_summary.startDate,
-                endDate=updated_summary.endDate,
-                companions=updated_summary.companions,
-                budget=updated_summary.budget,
-                travelStyles=updated_summary.travelStyles,
-                highlights=updated_summary.highlights,
-                dailySchedules=updated_summary.dailySchedules,
-                outboundTransportation=updated_summary.outboundTransportation,
-                returnTransportation=updated_summary.returnTransportation,
-                accommodations=updated_summary.accommodations
-            )
+
+class UsageTracker:
+    """Gemini 호출의 토큰 수, 지연 시간, 예상 비용을 엔드포인트/모델/여행/프롬프트 섹션별로 집계
+
+    호출마다 이벤트를 만들어 메모리 집계에 더하고, flush() 시 대기 중인 이벤트를 JSONL로 기록한다.
+    """
+
+    def __init__(self, log_file: Path, max_trips: int):
+        self.log_file = log_file
+        self.max_trips = max_trips
+        self.totals = self._empty()
+        self.by_endpoint: Dict[str, dict] = {}
+        self.by_model: Dict[str, dict] = {}
+        self.by_travel: "OrderedDict[str, dict]" = OrderedDict()
+        self.prompt_sections: Dict[str, Dict[str, float]] = {}  # 엔드포인트 -> 섹션 -> 추정 입력 토큰
+        self._pending: List[dict] = []
+
+    @staticmethod
+    def _empty() -> dict:
+        return {"requests": 0, "prompt_tokens": 0, "output_tokens": 0, "total_tokens": 0, "latency_seconds": 0.0, "cost_usd": 0.0}
+
+    @staticmethod
+    def _add(bucket: dict, event: dict) -> None:
+        bucket["requests"] += 1
+        for key in ("prompt_tokens", "output_tokens", "total_tokens", "latency_seconds", "cost_usd"):
+            bucket[key] += event[key]
+
+    def record(self, endpoint: str, model: str, response, latency: float, sections: Optional[Dict[str, int]] = None) -> dict:
+        """응답의 usage_metadata를 집계하고 이벤트 반환 (여행 ID는 attribute_trip으로 나중에 연결)"""
+        metadata = getattr(response, "usage_metadata", None)
+        prompt_tokens = int(getattr(metadata, "prompt_token_count", 0) or 0)
+        output_tokens = int(getattr(metadata, "candidates_token_count", 0) or 0)
+        total_tokens = int(getattr(metadata, "total_token_count", 0) or 0) or prompt_tokens + output_tokens
+        event = {
+            "ts": time.time(),
+            "endpoint": endpoint,
+            "model": model,
+            "travel_id": None,
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": total_tokens,
+            "latency_seconds": latency,
+            "cost_usd": (prompt_tokens * GEMINI_INPUT_PRICE_PER_1M + output_tokens * GEMINI_OUTPUT_PRICE_PER_1M) / 1_000_000,
         }
-    else:
-        travel_summary = extract_summary_from_plan(latest_plan, data)
+        self._add(self.totals, event)
+        self._add(self.by_endpoint.setdefault(endpoint, self._empty()), event)
+        self._add(self.by_model.setdefault(model, self._empty()), event)
+        if sections:
+            # 섹션별 입력 토큰은 문자 수 비율로 배분한 추정치
+            total_chars = sum(sections.values()) or 1
+            endpoint_sections = self.prompt_sections.setdefault(endpoint, {})
+            for name, chars in sections.items():
+                endpoint_sections[name] = endpoint_sections.get(name, 0.0) + prompt_tokens * chars / total_chars
+        self._pending.append(event)
+        return event
+
+    def attribute_trip(self, travel_id: str, event: Optional[dict]) -> None:
+        """이벤트를 여행 ID에 연결해 여행별 집계에 반영 (사전 생성 계획 등 이벤트가 없으면 무시)"""
+        if event is None:
+            return
+        event["travel_id"] = travel_id
+        bucket = self.by_travel.get(travel_id)
+        if bucket is None:
+            bucket = self.by_travel[travel_id] = {**self._empty(), "endpoints": {}}
+            while len(self.by_travel) > self.max_trips:
+                self.by_travel.popitem(last=False)
+        self.by_travel.move_to_end(travel_id)
+        self._add(bucket, event)
+        bucket["endpoints"][event["endpoint"]] = bucket["endpoints"].get(event["endpoint"], 0) + 1
+
+    def flush(self) -> int:
+        """대기 중인 이벤트를 로그 파일(JSONL)에 추가 기록"""
+        if not self._pending:
+            return 0
+        events, self._pending = self._pending, []
+        try:
+            with open(self.log_file, "ab") as f:
+                for event in events:
+                    f.write(orjson.dumps(event) + b"\n")
+        except Exception as e:
+            print(f"토큰 사용량 기록 실패: {e}")
+            self._pending = events + self._pending
+            return 0
+        return len(events)
+
+
+usage_tracker = UsageTracker(USAGE_LOG_FILE, USAGE_MAX_TRIPS)
+
+
+async def usage_flush_loop() -> None:
+    """USAGE_FLUSH_INTERVAL마다 토큰 사용량 로그 기록 (lifespan에서 시작)"""
+    while True:
+        await asyncio.sleep(USAGE_FLUSH_INTERVAL)
+        usage_tracker.flush()
+
+
+def travel_prompt_sections(prompt: str) -> Dict[str, int]:
+    """여행 생성 프롬프트의 섹션별 문자 수"""
+    return {"example": len(example_prompt), "instructions": len(prompt) - len(example_prompt)}
+
+
+async def generate_content(prompt: str):
+    """Gemini generate_content 비동기 호출 (GEMINI_TIMEOUT + 서킷 브레이커 적용)"""
+    return await gemini_breaker.call(
+        lambda: asyncio.wait_for(get_model().generate_content_async(prompt), GEMINI_TIMEOUT)
+    )
+
+
+async def generate_plan_text(prompt: str, endpoint: str, sections: Optional[Dict[str, int]] = None) -> Tuple[str, dict]:
+    """Gemini로 여행 계획 텍스트 생성 - (텍스트, 토큰 사용 이벤트) 반환"""
+    started = time.perf_counter()
+    response = await generate_content(prompt)
+    latency = time.perf_counter() - started
+    plan_reuse_stats["generations"] += 1
+    plan_reuse_stats["generation_seconds"] += latency
+    usage = usage_tracker.record(endpoint, GEMINI_MODEL_NAME, response, latency, sections)
+    return response.text, usage
+
+
+JSON_REPAIR_MODEL_CALLS = int(os.getenv("JSON_REPAIR_MODEL_CALLS", "2"))  # 계획 당 모델에 재요청할 최대 블록 수
+
+PLAN_BLOCK_SCHEMAS = {
+    "json": '{"day": 1, "schedules": [{"time": "09:00", "title": "장소", "description": "설명"}]}',
+    "transportation": '[{"origin": "출발지", "destination": "도착지", "name": "교통편명", "price": 65000}, {...귀환편...}]',
+    "accommodations": '[{"name": "숙소명", "address": "주소", "pricePerNight": 250000}]',
+}
+
+
+async def repair_block_with_model(kind: str, block: str, error: str) -> Optional[object]:
+    """로컬 수정으로 복구하지 못한 블록 하나만 모델에 다시 요청 - 복구된 데이터 또는 None"""
+    prompt = f"""아래 {kind} 코드 블록의 JSON이 올바르지 않습니다. ({error})
+내용은 그대로 유지하고 형식만 고친 JSON만 출력하세요. 설명 문장이나 코드 블록 표시(```)는 넣지 마세요.
+가격은 따옴표 없는 숫자(원 단위)로 작성하세요.
+
+[형식]
+{PLAN_BLOCK_SCHEMAS[kind]}
+
+[깨진 블록]
+{block}
+"""
+    started = time.perf_counter()
+    try:
+        response = await generate_content(prompt)
+    except Exception as e:
+        print(f"{kind} 블록 재요청 실패: {e}")
+        return None
+    usage_tracker.record(
+        "json-repair", GEMINI_MODEL_NAME, response, time.perf_counter() - started,
+        {"block": len(block), "instructions": len(prompt) - len(block)},
+    )
+    text = re.sub(r"^```\w*\s*\n?|\n?```\s*$", "", response.text.strip())
+    data, _, error = check_plan_block(kind, text)
+    if data is None:
+        print(f"{kind} 블록 재요청 결과도 올바르지 않음: {error}")
+    return data
+
+
+async def repair_plan_blocks(plan_text: str) -> str:
+    """계획의 JSON 블록을 검증하고, 깨진 블록만 복구해 본문에 다시 끼워 넣음
+
+    로컬 수정(따옴표, 끝 쉼표, 가격 표기, 잘린 괄호)을 먼저 시도하고, 그래도 실패한 블록만
+    JSON_REPAIR_MODEL_CALLS개까지 동시에 모델에 재요청한다. 복구하지 못한 블록은 그대로 둔다.
+    """
+    repairs: List[Tuple[re.Match, object]] = []
+    broken: List[Tuple[re.Match, str]] = []
+    for match in PLAN_BLOCK_PATTERN.finditer(plan_text):
+        json_repair_stats["blocks_checked"] += 1
+        unclosed = match.end(2) == len(plan_text)
+        data, fixes, error = check_plan_block(match.group(1), match.group(2), truncated=unclosed)
+        if unclosed and "truncated" not in fixes:
+            fixes.append("truncated")  # 닫는 ```가 없는 블록
+        if data is None:
+            broken.append((match, error))
+        elif fixes:
+            json_repair_stats["local_repaired"] += 1
+            for fix in fixes:
+                json_repair_stats["fixes"][fix] += 1
+            repairs.append((match, data))
+        else:
+            json_repair_stats["valid"] += 1
+
+    retry = broken[:JSON_REPAIR_MODEL_CALLS]
+    results = await asyncio.gather(*(repair_block_with_model(m.group(1), m.group(2), error) for m, error in retry))
+    for (match, _), data in zip(retry, results):
+        json_repair_stats["model_repaired" if data is not None else "model_failed"] += 1
+        if data is not None:
+            repairs.append((match, data))
+    json_repair_stats["unrecoverable"] += len(broken) - sum(data is not None for data in results)
+
+    if not repairs:
+        return plan_text
+    pieces = []
+    last = 0
+    for match, data in sorted(repairs, key=lambda repair: repair[0].start()):
+        pieces.append(plan_text[last:match.start(2)])
+        pieces.append(json.dumps(data, ensure_ascii=False))
+        if match.end(2) == len(plan_text):
+            pieces.append("\n```")
+        last = match.end(2)
+    pieces.append(plan_text[last:])
+    return "".join(pieces)
+
+
+def store_generated_plan(data: TravelInput, plan_text: str) -> Tuple[str, TripPlan, bool]:
+    """생성된 계획에서 요약을 추출해 저장소에 등록 (파일 저장은 호출 측에서)
+
+    동일 조건의 기존 여행이 있으면 그 ID를 갱신한다. (travel_id, 요약, 갱신 여부)를 반환.
+    """
+    summary = extract_summary_from_plan(plan_text, data)
+    existing_travel_id = find_existing_travel(data)
+    travel_id = existing_travel_id or str(uuid.uuid4())
+    put_travel_plan(travel_id, summary)
+    return travel_id, summary, existing_travel_id is not None
+
+
+# 인기 입력 조합 사전 생성 (오프피크 시간대에 미리 생성해두고 날짜만 다른 같은 조건의 요청에 날짜를 맞춰 즉시 제공)
+PREGEN_ENABLED = os.getenv("PREGEN_ENABLED", "false").lower() == "true"
+PREGEN_OFFPEAK_HOURS = os.getenv("PREGEN_OFFPEAK_HOURS", "2-6")  # 서버 로컬 시각 [시작, 끝) 시
+PREGEN_TOP_N = int(os.getenv("PREGEN_TOP_N", "10"))  # 사전 생성 대상 인기 조합 수
+PREGEN_TOKEN_BUDGET = int(os.getenv("PREGEN_TOKEN_BUDGET", "200000"))  # 오프피크 구간 당 토큰 예산
+PREGEN_TTL_SECONDS = int(os.getenv("PREGEN_TTL_SECONDS", str(3 * 24 * 3600)))  # 사전 생성 계획 유효 기간
+PREGEN_CHECK_INTERVAL = int(os.getenv("PREGEN_CHECK_INTERVAL", "600"))  # 스케줄러 확인 주기 (초)
+PREGEN_HISTORY_SIZE = int(os.getenv("PREGEN_HISTORY_SIZE", "1000"))  # 추적할 입력 조합 최대 개수
+
+
+@dataclass
+class PopularInput:
+    """요청 이력에서 집계한 입력 조합"""
+    data: TravelInput
+    score: float = 0.0
+    last_seen: float = 0.0
+
+
+@dataclass
+class PregeneratedPlan:
+    """사전 생성된 여행 계획 텍스트"""
+    data: TravelInput  # 생성에 사용한 입력 (날짜 이동 기준)
+    plan_text: str
+    generated_at: float
+    tokens: int = 0
+
+
+popular_inputs: Dict[tuple, PopularInput] = {}
+pregenerated_plans: Dict[tuple, PregeneratedPlan] = {}
+pregen_state = {"window": None, "tokens_used": 0, "generated": 0, "served": 0}
+
+
+def trip_length_days(data: TravelInput) -> Optional[int]:
+    start, end = parse_trip_date(data.start_date), parse_trip_date(data.end_date)
+    if start is None or end is None:
+        return None
+    return (end - start).days
+
+
+def pregeneration_key(data: TravelInput) -> tuple:
+    """인기 조합 키 - 날짜를 제외한 모든 입력 조건 + 여행 기간 일수
+
+    계획 본문의 교통편·숙소·예산 피드백은 출발지/동행자/예산에 따라 달라지므로 키에 포함하고,
+    날짜만 다른 요청은 같은 조합으로 집계해 제공할 때 요청 날짜로 이동한다.
+    """
+    return (
+        normalize_destination(data.destination),
+        data.departure.strip(),
+        data.companions.strip(),
+        data.budget.strip(),
+        frozenset(style.value for style in data.style),
+        trip_length_days(data),
+    )
+
+
+def record_travel_request(data: TravelInput) -> None:
+    """요청 이력에 입력 조합 집계 (최대 PREGEN_HISTORY_SIZE개, 초과 시 점수가 가장 낮은 조합 제거)
+
+    조합별로 가장 최근 요청을 사전 생성 입력으로 사용한다.
+    """
+    key = pregeneration_key(data)
+    entry = popular_inputs.get(key)
+    if entry is None:
+        if len(popular_inputs) >= PREGEN_HISTORY_SIZE:
+            del popular_inputs[min(popular_inputs, key=lambda k: popular_inputs[k].score)]
+        entry = popular_inputs[key] = PopularInput(data=data)
+    entry.data = data
+    entry.score += 1
+    entry.last_seen = time.time()
+
+
+def take_pregenerated_plan(data: TravelInput) -> Optional[str]:
+    """같은 조합의 사전 생성 계획이 유효 기간 내에 있으면 요청 날짜로 이동해 반환
+
+    날짜 이동은 저장된 여행의 날짜 조정 재사용과 같은 방식(shift_dates_in_text)이며,
+    이동 거리가 DATE_SHIFT_MAX_DAYS를 넘으면 계절이 달라지므로 사용하지 않는다.
+    """
+    entry = pregenerated_plans.get(pregeneration_key(data))
+    if entry is None or time.time() - entry.generated_at >= PREGEN_TTL_SECONDS:
+        return None
+    source_start, source_end = parse_trip_date(entry.data.start_date), parse_trip_date(entry.data.end_date)
+    new_start = parse_trip_date(data.start_date)
+    if source_start is None or source_end is None or new_start is None:
+        return None
+    delta_days = (new_start - source_start).days
+    if abs(delta_days) > DATE_SHIFT_MAX_DAYS:
+        return None
+    pregen_state["served"] += 1
+    if delta_days == 0:
+        return entry.plan_text
+    return shift_dates_in_text(entry.plan_text, delta_days, source_start, source_end)
+
+
+def _parse_hour_range(value: str) -> Tuple[int, int]:
+    start, _, end = value.partition("-")
+    return int(start), int(end or start)
+
+
+def in_offpeak_window(now: datetime) -> bool:
+    """현재 시각이 오프피크 구간인지 확인 (자정을 넘는 구간 허용, 예: 23-5)"""
+    start, end = _parse_hour_range(PREGEN_OFFPEAK_HOURS)
+    if start <= end:
+        return start <= now.hour < end
+    return now.hour >= start or now.hour < end
+
+
+def _offpeak_window_id(now: datetime) -> str:
+    """토큰 예산을 초기화할 오프피크 구간 식별자 (구간이 시작된 날짜)"""
+    start, end = _parse_hour_range(PREGEN_OFFPEAK_HOURS)
+    day = now.date()
+    if start > end and now.hour < end:
+        day -= timedelta(days=1)
+    return day.isoformat()
+
+
+def pregeneration_candidates(now: datetime) -> List[tuple]:
+    """사전 생성(또는 갱신)이 필요한 인기 조합 키 목록 (점수 순)"""
+    today = now.strftime("%Y-%m-%d")
+    ranked = heapq.nlargest(PREGEN_TOP_N, popular_inputs, key=lambda k: popular_inputs[k].score)
+    candidates = []
+    for key in ranked:
+        if normalize_date(popular_inputs[key].data.start_date) < today:
+            continue  # 이미 지난 여행은 제외
+        entry = pregenerated_plans.get(key)
+        # 유효 기간의 절반이 지나면 만료 전에 미리 갱신
+        if entry is None or now.timestamp() - entry.generated_at >= PREGEN_TTL_SECONDS / 2:
+            candidates.append(key)
+    return candidates
+
+
+async def run_pregeneration(now: Optional[datetime] = None) -> int:
+    """오프피크 구간이면 토큰 예산 내에서 인기 조합을 사전 생성. 생성한 개수 반환"""
+    now = now or datetime.now()
+    if not in_offpeak_window(now):
+        return 0
+
+    window = _offpeak_window_id(now)
+    if pregen_state["window"] != window:
+        # 새 오프피크 구간: 예산 초기화, 이전 점수 감쇠(최근 인기 반영), 만료 계획 정리
+        pregen_state["window"] = window
+        pregen_state["tokens_used"] = 0
+        for entry in popular_inputs.values():
+            entry.score /= 2
+        for key in [k for k, v in pregenerated_plans.items() if now.timestamp() - v.generated_at >= PREGEN_TTL_SECONDS]:
+            del pregenerated_plans[key]
+
+    generated = 0
+    for key in pregeneration_candidates(now):
+        if pregen_state["tokens_used"] >= PREGEN_TOKEN_BUDGET:
+            break
+        data = popular_inputs[key].data
+        prompt = build_travel_prompt(data)
+        started = time.perf_counter()
+        try:
+            response = await generate_content(prompt)
+        except Exception as e:
+            print(f"사전 생성 실패 ({data.destination}): {e}")
+            continue
+        usage = usage_tracker.record(
+            "pregeneration", GEMINI_MODEL_NAME, response, time.perf_counter() - started, travel_prompt_sections(prompt)
+        )
+        tokens = usage["total_tokens"] or (len(prompt) + len(response.text)) // 2
+        pregen_state["tokens_used"] += tokens
+        pregen_state["generated"] += 1
+        # 제공할 때마다 복구하지 않도록 JSON 블록 복구를 마친 텍스트를 저장
+        plan_text = await repair_plan_blocks(response.text)
+        pregenerated_plans[key] = PregeneratedPlan(data=data, plan_text=plan_text, generated_at=time.time(), tokens=tokens)
+        generated += 1
+    return generated
+
+
+async def pregeneration_loop() -> None:
+    """PREGEN_CHECK_INTERVAL마다 사전 생성 실행 (lifespan에서 시작)"""
+    while True:
+        try:
+            await run_pregeneration()
+        except Exception as e:
+            print(f"사전 생성 스케줄러 오류: {e}")
+        await asyncio.sleep(PREGEN_CHECK_INTERVAL)
+
+
+async def obtain_plan_text(data: TravelInput, endpoint: str) -> Tuple[str, Optional[dict]]:
+    """사전 생성된 계획이 있으면 즉시 사용하고, 없으면 Gemini로 생성 (JSON 블록 복구 포함) - (텍스트, 토큰 사용 이벤트)"""
+    plan_text = take_pregenerated_plan(data)
+    if plan_text is not None:
+        return plan_text, None  # 사전 생성 시 JSON 블록 복구를 마친 텍스트
+    prompt = build_travel_prompt(data)
+    plan_text, usage = await generate_plan_text(prompt, endpoint, travel_prompt_sections(prompt))
+    # 깨진 JSON 블록은 전체 재생성 대신 해당 블록만 복구
+    return await repair_plan_blocks(plan_text), usage
+
+
+@app.post("/Travel-Plan", dependencies=[Depends(rate_limit("generation"))])
+async def create_travel_plan(data: TravelInput = Body(...)):
+    return FastJSONResponse(await generate_travel_plan(data, "/Travel-Plan"))
+
+
+async def generate_travel_plan(data: TravelInput, endpoint: str) -> dict:
+    """여행 계획 생성 (날짜 이동 재사용 → 사전 생성 → Gemini 순) 후 저장하고 응답 dict 반환"""
+    global latest_plan, latest_travel_id, chat_history
+    chat_history = []
+
+    record_travel_request(data)
+    plan_reuse_stats["requests"] += 1
+
+    # 날짜만 다른 동일 여행이 있으면 Gemini 호출 없이 날짜를 이동해 재사용
+    shift_candidate = None
+    if DATE_SHIFT_ENABLED and find_existing_travel(data) is None:
+        shift_candidate = find_date_shift_candidate(data)
+    if shift_candidate is not None:
+        started = time.perf_counter()
+        source_id, delta_days = shift_candidate
+        summary = shift_trip_plan(source_id, delta_days, data)
+        latest_plan = summary.fullPlan
         travel_id = str(uuid.uuid4())
-        travel_summaries_store[travel_id] = travel_summary
+        latest_travel_id = travel_id
+        put_travel_plan(travel_id, summary)
         save_travel_summaries()
-        
-        # 사용자에게는 JSON 블록 없이 깨끗한 텍스트만 전달
-        clean_plan = remove_json_blocks(latest_plan)
+        save_plan_to_file(latest_plan)
+        plan_reuse_stats["date_shift_hits"] += 1
+        plan_reuse_stats["date_shift_seconds"] += time.perf_counter() - started
         
         return {
-            "plan": clean_plan,
+            "plan": remove_json_blocks(latest_plan),
             "travel_id": travel_id,
-            "message": "새로운 여행 계획이 생성되었습니다.",
-            "summary": TripPlanResponse(
-                title=travel_summary.title,
-                destination=travel_summary.destination,
-                departure=travel_summary.departure,
-                startDate=travel_summary.startDate,
-                endDate=travel_summary.endDate,
-                companions=travel_summary.companions,
-                budget=travel_summary.budget,
-                travelStyles=travel_summary.travelStyles,
-                highlights=travel_summary.highlights,
-                dailySchedules=travel_summary.dailySchedules,
-                outboundTransportation=travel_summary.outboundTransportation,
-                returnTransportation=travel_summary.returnTransportation,
-                accommodations=travel_summary.accommodations
-            )
+            "message": f"기존 여행 계획의 날짜를 {delta_days:+d}일 조정했습니다.",
+            "adapted": True,
+            "adapted_from": source_id,
+            "summary": to_plan_response(summary)
+        }
+
+    latest_plan, usage = await obtain_plan_text(data, endpoint)
+    save_plan_to_file(latest_plan)
+    
+    travel_id, summary, updated = store_generated_plan(data, latest_plan)
+    latest_travel_id = travel_id
+    usage_tracker.attribute_trip(travel_id, usage)
+    save_travel_summaries()
+    
+    # 사용자에게는 JSON 블록 없이 깨끗한 텍스트만 전달
+    clean_plan = remove_json_blocks(latest_plan)
+    
+    return {
+        "plan": clean_plan,
+        "travel_id": travel_id,
+        "message": "기존 여행 계획이 업데이트되었습니다." if updated else "새로운 여행 계획이 생성되었습니다.",
+        "adapted": False,
+        "summary": to_plan_response(summary)
+    }
+
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))  # 백그라운드 생성 워커 수 (동시 Gemini 호출 상한)
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))  # 대기 가능한 최대 작업 수
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))  # 완료된 작업 결과 보관 기간
+JOB_MAX_RETAINED = int(os.getenv("JOB_MAX_RETAINED", "1000"))  # 보관하는 최대 작업 수
+JOB_SSE_KEEPALIVE = 15  # SSE 연결 유지용 주석 전송 주기 (초)
+
+
+@dataclass
+class PlanJob:
+    job_id: str
+    data: TravelInput
+    created_at: float
+    status: str = "queued"  # queued → running → succeeded | failed
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    done: Optional[asyncio.Event] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def snapshot(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "created_at": datetime.fromtimestamp(self.created_at).isoformat(timespec="seconds"),
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds") if self.started_at else None,
+            "finished_at": datetime.fromtimestamp(self.finished_at).isoformat(timespec="seconds") if self.finished_at else None,
+            "result": self.result,
+            "error": self.error,
         }
 
+
+plan_jobs: "OrderedDict[str, PlanJob]" = OrderedDict()  # job_id -> 작업 (생성 순서)
+job_queue: Optional[asyncio.Queue] = None  # lifespan에서 이벤트 루프에 맞춰 생성
+
+
+def prune_jobs(now: float) -> None:
+    """보관 기간이 지난 완료 작업, 최대 개수를 넘는 오래된 완료 작업 삭제 (대기/실행 중 작업은 유지)"""
+    excess = len(plan_jobs) - JOB_MAX_RETAINED
+    for job_id, job in list(plan_jobs.items()):
+        if not job.finished:
+            continue
+        if excess > 0 or now - job.finished_at >= JOB_TTL_SECONDS:
+            del plan_jobs[job_id]
+            excess -= 1
+
+
+async def run_plan_job(job: PlanJob) -> None:
+    job.status = "running"
+    job.started_at = time.time()
+    try:
+        job.result = await generate_travel_plan(job.data, "/Travel-Plan/jobs")
+        job.status = "succeeded"
+    except Exception as e:
+        job.error = str(e) or type(e).__name__
+        job.status = "failed"
+        print(f"여행 계획 작업 실패 ({job.job_id}): {job.error}")
+    finally:
+        job.finished_at = time.time()
+        job.done.set()
+
+
+async def job_worker() -> None:
+    """작업 큐에서 하나씩 꺼내 생성 (클라이언트 연결과 무관하게 끝까지 실행)"""
+    while True:
+        job = await job_queue.get()
+        try:
+            await run_plan_job(job)
+        finally:
+            job_queue.task_done()
+
+
+def start_job_workers() -> List[asyncio.Task]:
+    global job_queue
+    job_queue = asyncio.Queue(maxsize=JOB_QUEUE_SIZE)
+    return [asyncio.create_task(job_worker()) for _ in range(JOB_WORKERS)]
+
+
+@app.post("/Travel-Plan/jobs", status_code=202, dependencies=[Depends(rate_limit("generation"))])
+async def submit_travel_plan_job(data: TravelInput = Body(...)):
+    """여행 계획 생성을 백그라운드 작업으로 등록하고 job_id를 바로 반환합니다.
+
+    결과는 GET /Travel-Plan/jobs/{job_id} 폴링 또는 /events(SSE)로 받습니다.
+    """
+    now = time.time()
+    prune_jobs(now)
+    job = PlanJob(job_id=str(uuid.uuid4()), data=data, created_at=now, done=asyncio.Event())
+    try:
+        job_queue.put_nowait(job)
+    except asyncio.QueueFull:
+        return ORJSONResponse(
+            status_code=503,
+            content={"success": False, "error": "대기 중인 생성 작업이 너무 많습니다. 잠시 후 다시 시도하세요."},
+            headers={"Retry-After": "10"},
+        )
+    plan_jobs[job.job_id] = job
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "queue_position": job_queue.qsize(),
+        "status_url": f"/Travel-Plan/jobs/{job.job_id}",
+        "events_url": f"/Travel-Plan/jobs/{job.job_id}/events",
+    }
+
+
+def job_not_found(job_id: str) -> ORJSONResponse:
+    return ORJSONResponse(status_code=404, content={"error": "작업 ID 없음 (만료되었거나 존재하지 않음)", "job_id": job_id})
+
+
+@app.get("/Travel-Plan/jobs/{job_id}", dependencies=[Depends(rate_limit("read"))])
+async def get_travel_plan_job(job_id: str):
+    """작업 상태를 조회합니다. 완료되면 result에 /Travel-Plan과 같은 응답이 담깁니다."""
+    prune_jobs(time.time())
+    job = plan_jobs.get(job_id)
+    if job is None:
+        return job_not_found(job_id)
+    return FastJSONResponse(job.snapshot())
+
+
+@app.get("/Travel-Plan/jobs/{job_id}/events", dependencies=[Depends(rate_limit("read"))])
+async def stream_travel_plan_job(job_id: str):
+    """작업 완료를 SSE로 알립니다. (status 이벤트 → 완료 시 succeeded/failed 이벤트)
+
+    연결이 끊겨도 작업은 계속 실행되며, 다시 연결하거나 상태 조회로 결과를 받을 수 있습니다.
+    """
+    job = plan_jobs.get(job_id)
+    if job is None:
+        return job_not_found(job_id)
+
+    def event(name: str, payload: dict) -> bytes:
+        return b"event: " + name.encode() + b"\ndata: " + orjson.dumps(payload, default=_orjson_default) + b"\n\n"
+
+    async def stream():
+        yield event("status", {"job_id": job.job_id, "status": job.status})
+        while not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=JOB_SSE_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+        yield event(job.status, job.snapshot())
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/admin/jobs", dependencies=ADMIN_DEPENDENCIES)
+async def get_job_stats():
+    """백그라운드 생성 작업 큐와 상태별 작업 수를 조회합니다."""
+    counts: Dict[str, int] = {}
+    for job in plan_jobs.values():
+        counts[job.status] = counts.get(job.status, 0) + 1
+    return {
+        "workers": JOB_WORKERS,
+        "queue_size": job_queue.qsize() if job_queue is not None else 0,
+        "queue_capacity": JOB_QUEUE_SIZE,
+        "ttl_seconds": JOB_TTL_SECONDS,
+        "jobs": counts,
+    }
+
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50"))  # 배치 요청 당 최대 입력 수
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))  # 동시 Gemini 호출 상한
+
+
+class BatchTravelInput(BaseModel):
+    items: List[TravelInput] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(default=None, ge=1)  # 미지정 시 BATCH_MAX_CONCURRENCY
+
+
+@app.post("/Travel-Plan/batch")
+async def create_travel_plans_batch(batch: BatchTravelInput, clients: List[str] = Depends(client_keys)):
+    """여러 여행 계획을 동시에 생성하고, 완료되는 순서대로 NDJSON으로 스트리밍합니다.
+
+    각 줄: {"index", "travel_id", "updated", "summary"} 또는 {"index", "error"}
+    저장 파일은 배치가 끝날 때(또는 연결이 끊길 때) 한 번만 기록됩니다.
+    생성 할당량은 입력 수만큼 차감됩니다.
+    """
+    if len(batch.items) > BATCH_MAX_ITEMS:
+        return {"error": f"한 번에 최대 {BATCH_MAX_ITEMS}개까지 생성할 수 있습니다."}
+    enforce_rate_limit(clients, "generation", cost=len(batch.items))
+
+    semaphore = asyncio.Semaphore(min(batch.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    stored_ids: List[str] = []
+
+    async def run(index: int, data: TravelInput) -> dict:
+        async with semaphore:
+            try:
+                plan_text, usage = await obtain_plan_text(data, "/Travel-Plan/batch")
+                travel_id, summary, updated = store_generated_plan(data, plan_text)
+                usage_tracker.attribute_trip(travel_id, usage)
+            except Exception as e:
+                return {"index": index, "error": str(e)}
+        stored_ids.append(travel_id)
+        return {"index": index, "travel_id": travel_id, "updated": updated, "summary": to_plan_response(summary)}
+
+    async def stream():
+        tasks = [asyncio.create_task(run(index, data)) for index, data in enumerate(batch.items)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                result = await finished
+                yield orjson.dumps(result, default=_orjson_default) + b"\n"
+        finally:
+            # 클라이언트 연결이 끊기면 남은 생성은 취소하고, 완료된 결과는 한 번에 저장
+            for task in tasks:
+                task.cancel()
+            if stored_ids:
+                save_travel_summaries()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.get("/admin/pregeneration", dependencies=ADMIN_DEPENDENCIES)
+async def get_pregeneration_status():
+    """사전 생성 스케줄러 상태와 인기 입력 조합을 조회합니다."""
+    now = time.time()
+    top = heapq.nlargest(PREGEN_TOP_N, popular_inputs.items(), key=lambda item: item[1].score)
+    return {
+        "enabled": PREGEN_ENABLED,
+        "offpeak_hours": PREGEN_OFFPEAK_HOURS,
+        "token_budget": PREGEN_TOKEN_BUDGET,
+        **pregen_state,
+        "popular_inputs": [
+            {
+                "destination": entry.data.destination,
+                "start_date": entry.data.start_date,
+                "end_date": entry.data.end_date,
+                "departure": entry.data.departure,
+                "companions": entry.data.companions,
+                "budget": entry.data.budget,
+                "trip_days": trip_length_days(entry.data),
+                "styles": sorted(style.value for style in entry.data.style),
+                "score": round(entry.score, 2),
+                "pregenerated": key in pregenerated_plans,
+            }
+            for key, entry in top
+        ],
+        "pregenerated": [
+            {
+                "destination": entry.data.destination,
+                "departure": entry.data.departure,
+                "start_date": entry.data.start_date,
+                "styles": sorted(style.value for style in entry.data.style),
+                "age_seconds": int(now - entry.generated_at),
+                "tokens": entry.tokens,
+            }
+            for key, entry in pregenerated_plans.items()
+        ],
+    }
+
+@app.get("/admin/plan-reuse", dependencies=ADMIN_DEPENDENCIES)
+async def get_plan_reuse_stats():
+    """날짜 조정 재사용 적중률과 절감된 생성 시간을 조회합니다."""
+    stats = plan_reuse_stats
+    avg_generation = stats["generation_seconds"] / stats["generations"] if stats["generations"] else None
+    avg_date_shift = stats["date_shift_seconds"] / stats["date_shift_hits"] if stats["date_shift_hits"] else None
+    saved_seconds = None
+    if avg_generation is not None and avg_date_shift is not None:
+        saved_seconds = round((avg_generation - avg_date_shift) * stats["date_shift_hits"], 3)
+    return {
+        **stats,
+        "date_shift_hit_rate": round(stats["date_shift_hits"] / stats["requests"], 4) if stats["requests"] else 0.0,
+        "avg_generation_seconds": avg_generation,
+        "avg_date_shift_seconds": avg_date_shift,
+        "estimated_saved_seconds": saved_seconds,
+    }
+
+@app.get("/admin/usage", dependencies=ADMIN_DEPENDENCIES)
+async def get_usage(travel_id: Optional[str] = None, top: int = Query(default=20, ge=1, le=200)):
+    """Gemini 토큰 사용량과 예상 비용을 조회합니다. (travel_id 지정 시 해당 여행만)"""
+    if travel_id is not None:
+        bucket = usage_tracker.by_travel.get(travel_id)
+        if bucket is None:
+            return {"error": f"여행 ID '{travel_id}'의 사용 기록이 없습니다."}
+        return {"travel_id": travel_id, **bucket}
+    top_trips = heapq.nlargest(top, usage_tracker.by_travel.items(), key=lambda item: item[1]["total_tokens"])
+    return {
+        "pricing_usd_per_1m_tokens": {"input": GEMINI_INPUT_PRICE_PER_1M, "output": GEMINI_OUTPUT_PRICE_PER_1M},
+        "totals": usage_tracker.totals,
+        "by_endpoint": usage_tracker.by_endpoint,
+        "by_model": usage_tracker.by_model,
+        "prompt_sections": {
+            endpoint: {name: round(tokens) for name, tokens in sections.items()}
+            for endpoint, sections in usage_tracker.prompt_sections.items()
+        },
+        "top_trips": [{"travel_id": trip_id, **bucket} for trip_id, bucket in top_trips],
+    }
+
+@app.get("/admin/json-repair", dependencies=ADMIN_DEPENDENCIES)
+async def get_json_repair_stats():
+    """생성 계획의 JSON 블록 검증/복구 경로별 횟수를 조회합니다."""
+    return json_repair_stats
+
+@app.get("/admin/circuit-breakers", dependencies=ADMIN_DEPENDENCIES)
+async def get_circuit_breakers():
+    """외부 의존성(Gemini, Spring Boot) 서킷 브레이커 상태를 조회합니다."""
+    return {breaker.name: breaker.snapshot() for breaker in (gemini_breaker, spring_breaker)}
+
+# 멱등성 키 설정 (모바일 클라이언트 재시도 흡수)
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))  # 첫 응답 보관 기간
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))  # 보관하는 최대 키 수
+
+
+class IdempotencyConflictError(Exception):
+    """같은 Idempotency-Key가 다른 요청 내용으로 재사용된 경우"""
+
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__("같은 Idempotency-Key가 다른 요청에 이미 사용되었습니다. 새 키를 사용하세요.")
+
+
+@dataclass
+class IdempotencyEntry:
+    fingerprint: str
+    future: asyncio.Future
+    expires_at: float
+
+
+class IdempotencyStore:
+    """Idempotency-Key → 첫 응답 저장소 (TTL + 최대 개수, 삽입 순서대로 만료)
+
+    같은 키로 다시 들어온 요청은 핸들러를 실행하지 않고 첫 응답을 그대로 돌려준다.
+    첫 요청이 아직 처리 중이면 그 결과를 기다린다. 첫 요청이 예외로 끝나거나
+    should_store가 False인 결과(실패 응답)는 보관하지 않아 재시도가 다시 실행된다.
+    """
+
+    def __init__(self, ttl: float, max_keys: int):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, IdempotencyEntry]" = OrderedDict()
+        self.stats = {"executed": 0, "replayed": 0, "joined_in_flight": 0, "conflicts": 0}
+
+    def _evict(self, now: float) -> None:
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.expires_at > now and len(self._entries) < self.max_keys:
+                break
+            del self._entries[key]
+
+    def _discard(self, key: str, entry: IdempotencyEntry) -> None:
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+
+    async def run(self, scope: str, key: str, fingerprint: str, handler, should_store=lambda result: True) -> Tuple[object, bool]:
+        """handler()를 (scope, key)당 한 번만 실행하고 (결과, 재사용 여부) 반환"""
+        client_key, key = key, f"{scope}:{key}"
+        while True:
+            now = time.monotonic()
+            self._evict(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                break
+            if entry.fingerprint != fingerprint:
+                self.stats["conflicts"] += 1
+                raise IdempotencyConflictError(client_key)
+            in_flight = not entry.future.done()
+            try:
+                # shield: 기다리던 재시도 요청이 끊겨도 첫 요청은 취소되지 않음
+                result = await asyncio.shield(entry.future)
+            except asyncio.CancelledError:
+                if entry.future.cancelled():
+                    continue  # 첫 요청이 취소됨 → 이 요청이 직접 처리
+                raise
+            self.stats["joined_in_flight" if in_flight else "replayed"] += 1
+            return result, True
+
+        entry = IdempotencyEntry(fingerprint, asyncio.get_running_loop().create_future(), now + self.ttl)
+        self._entries[key] = entry
+        self.stats["executed"] += 1
+        try:
+            result = await handler()
+        except asyncio.CancelledError:
+            self._discard(key, entry)
+            entry.future.cancel()
+            raise
+        except Exception as e:
+            self._discard(key, entry)
+            entry.future.set_exception(e)
+            entry.future.exception()  # 기다리는 요청이 없어도 "never retrieved" 경고가 나지 않도록
+            raise
+        if not should_store(result):
+            self._discard(key, entry)
+        entry.future.set_result(result)
+        return result, False
+
+    def snapshot(self) -> dict:
+        return {"keys": len(self._entries), "ttl_seconds": self.ttl, "max_keys": self.max_keys, **self.stats}
+
+
+idempotency_store = IdempotencyStore(IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_KEYS)
+
+
+def idempotency_scope(endpoint: str, clients: List[str]) -> str:
+    """키 충돌을 막기 위해 엔드포인트 + 사용자(client_keys의 사용자 키 - 토큰 해시, 없으면 IP)별로 키 공간 분리"""
+    return f"{endpoint}:{clients[-1]}"
+
+
+def request_fingerprint(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+async def run_idempotent(scope: str, idempotency_key: Optional[str], fingerprint: str, response: Response, handler, should_store):
+    """Idempotency-Key 헤더가 있으면 멱등 처리, 없으면 그대로 실행"""
+    if not idempotency_key:
+        return await handler()
+    result, replayed = await idempotency_store.run(scope, idempotency_key, fingerprint, handler, should_store)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+@app.exception_handler(IdempotencyConflictError)
+async def idempotency_conflict_handler(request: Request, exc: IdempotencyConflictError):
+    return ORJSONResponse(status_code=422, content={"success": False, "error": str(exc), "idempotency_key": exc.key})
+
+
+@app.get("/admin/rate-limits", dependencies=ADMIN_DEPENDENCIES)
+async def get_rate_limits():
+    """클라이언트별 요청 제한 정책과 분류별 허용/거부 횟수를 조회합니다."""
+    return rate_limiter.snapshot()
+
+@app.get("/admin/idempotency", dependencies=ADMIN_DEPENDENCIES)
+async def get_idempotency_stats():
+    """멱등성 키 저장소 상태 (재사용/처리 중 합류/충돌 횟수)를 조회합니다."""
+    return idempotency_store.snapshot()
+
 @app.post("/feedback")
-async def feedback(data: FeedbackInput):
+async def feedback(
+    data: FeedbackInput,
+    response: Response,
+    clients: List[str] = Depends(rate_limit("feedback")),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+):
+    """피드백을 반영해 최신 여행 일정을 수정합니다. (Idempotency-Key 지원)"""
+    return await run_idempotent(
+        idempotency_scope("/feedback", clients),
+        idempotency_key,
+        request_fingerprint(data.message),
+        response,
+        lambda: apply_feedback(data),
+        should_store=lambda result: "error" not in result,
+    )
+
+
+async def apply_feedback(data: FeedbackInput) -> dict:
     global latest_plan, chat_history
 
     if latest_plan is None:
@@ -755,10 +2593,16 @@ async def feedback(data: FeedbackInput):
 이제 위 형식을 기반으로, 사용자의 피드백을 반영한 여행 일정을 작성하세요.
 """
 
-    model = genai.GenerativeModel("models/gemini-2.0-flash")
-    response = model.generate_content(prompt)
-    
-    latest_plan = response.text
+    sections = {
+        "existing_plan": len(latest_plan),
+        "history": len(history_prompt),
+        "feedback": len(data.message),
+        "example": len(example_prompt),
+    }
+    sections["instructions"] = max(len(prompt) - sum(sections.values()), 0)
+    latest_plan, usage = await generate_plan_text(prompt, "/feedback", sections)
+    if latest_travel_id is not None:
+        usage_tracker.attribute_trip(latest_travel_id, usage)
     save_plan_to_file(latest_plan)
     chat_history.append(data.message)
     
@@ -767,60 +2611,66 @@ async def feedback(data: FeedbackInput):
     
     return {"reply": clean_plan}
 
-@app.get("/travel-summary/{travel_id}")
-async def get_travel_summary(travel_id: str):
-    """특정 여행의 요약 정보를 조회합니다."""
+@app.get("/travel-summary/{travel_id}", dependencies=[Depends(rate_limit("read"))])
+async def get_travel_summary(travel_id: str, request: Request):
+    """특정 여행의 요약 정보를 조회합니다. (If-None-Match 지원)"""
     if travel_id not in travel_summaries_store:
         return {"error": f"여행 ID '{travel_id}'를 찾을 수 없습니다."}
     
     summary = travel_summaries_store[travel_id]
-    return TripPlanResponse(
-        title=summary.title,
-        destination=summary.destination,
-        departure=summary.departure,
-        startDate=summary.startDate,
-        endDate=summary.endDate,
-        companions=summary.companions,
-        budget=summary.budget,
-        travelStyles=summary.travelStyles,
-        highlights=summary.highlights,
-        dailySchedules=summary.dailySchedules,
-        outboundTransportation=summary.outboundTransportation,
-        returnTransportation=summary.returnTransportation,
-        accommodations=summary.accommodations
-    )
-
-@app.get("/travel-summaries")
-async def get_all_travel_summaries():
-    """저장된 모든 여행 요약 정보를 조회합니다."""
-    summaries = []
-    for summary in travel_summaries_store.values():
-        summaries.append(TripPlanResponse(
-            title=summary.title,
-            destination=summary.destination,
-            departure=summary.departure,
-            startDate=summary.startDate,
-            endDate=summary.endDate,
-            companions=summary.companions,
-            budget=summary.budget,
-            travelStyles=summary.travelStyles,
-            highlights=summary.highlights,
-            dailySchedules=summary.dailySchedules,
-            outboundTransportation=summary.outboundTransportation,
-            returnTransportation=summary.returnTransportation,
-            accommodations=summary.accommodations
-        ))
+    return conditional_json_response(request, travel_etags[travel_id], lambda: to_plan_response(summary))
+
+@app.get("/travel-summaries", dependencies=[Depends(rate_limit("read"))])
+async def get_all_travel_summaries(request: Request):
+    """저장된 모든 여행 요약 정보를 조회합니다. (If-None-Match 지원)"""
+    def build():
+        summaries = [to_plan_response(summary) for summary in travel_summaries_store.values()]
+        return {"summaries": summaries, "total": len(summaries)}
     
-    return {"summaries": summaries, "total": len(summaries)}
-
-@app.get("/travel-plan/{travel_id}")
-async def get_travel_plan(travel_id: str):
-    """특정 여행의 전체 계획을 조회합니다."""
+    return conditional_json_response(request, get_summaries_etag(), build)
+
+@app.get("/travel-search", dependencies=[Depends(rate_limit("read"))])
+async def search_travels(
+    destination: Optional[str] = None,
+    style: Optional[List[TravelStyle]] = Query(default=None),
+    start_from: Optional[str] = None,
+    start_to: Optional[str] = None,
+    end_from: Optional[str] = None,
+    end_to: Optional[str] = None,
+    sort: Literal["start_date", "end_date"] = "start_date",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+):
+    """여행지, 여행 스타일(모두 포함), 시작/종료일 범위로 저장된 여행을 검색합니다."""
+    travel_ids, total = search_travel_ids(
+        destination=destination,
+        styles=style,
+        start_from=normalize_date(start_from) if start_from else None,
+        start_to=normalize_date(start_to) if start_to else None,
+        end_from=normalize_date(end_from) if end_from else None,
+        end_to=normalize_date(end_to) if end_to else None,
+        sort=sort,
+        order=order,
+        limit=limit,
+        offset=offset,
+    )
+    results = [
+        {"travel_id": travel_id, "summary": to_plan_response(travel_summaries_store[travel_id])}
+        for travel_id in travel_ids
+    ]
+    return FastJSONResponse({"results": results, "total": total, "limit": limit, "offset": offset})
+
+@app.get("/travel-plan/{travel_id}", dependencies=[Depends(rate_limit("read"))])
+async def get_travel_plan(travel_id: str, request: Request):
+    """특정 여행의 전체 계획을 조회합니다. (If-None-Match 지원)"""
     if travel_id not in travel_summaries_store:
         return {"error": f"여행 ID '{travel_id}'를 찾을 수 없습니다."}
     
     summary = travel_summaries_store[travel_id]
-    return {"id": travel_id, "plan": summary.full_plan}
+    return conditional_json_response(
+        request, travel_etags[travel_id], lambda: {"id": travel_id, "plan": get_full_plan(summary)}
+    )
 
 @app.delete("/travel/{travel_id}")
 async def delete_travel(travel_id: str):
@@ -828,7 +2678,7 @@ async def delete_travel(travel_id: str):
     if travel_id not in travel_summaries_store:
         return {"error": f"여행 ID '{travel_id}'를 찾을 수 없습니다."}
     
-    del travel_summaries_store[travel_id]
+    remove_travel_plan(travel_id)
     save_travel_summaries()
     
     return {"message": f"여행 ID '{travel_id}'가 성공적으로 삭제되었습니다."}
@@ -836,30 +2686,33 @@ async def delete_travel(travel_id: str):
 @app.post("/save-plan/{travel_id}")
 async def save_plan(
     travel_id: str, 
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    response: Response,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    clients: List[str] = Depends(client_keys),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
 ):
-    """여행 계획을 Spring Boot 서버로 전송하여 DB에 저장합니다."""
+    """여행 계획을 Spring Boot 서버로 전송하여 DB에 저장합니다. (Idempotency-Key 지원)
+
+    같은 키로 재시도하면 Spring Boot에 다시 보내지 않고 첫 성공 응답을 돌려줍니다.
+    """
+    return await run_idempotent(
+        idempotency_scope("/save-plan", clients),
+        idempotency_key,
+        request_fingerprint(travel_id),
+        response,
+        lambda: send_plan_to_spring(travel_id, credentials),
+        should_store=lambda result: result.get("success") is True,
+    )
+
+
+async def send_plan_to_spring(travel_id: str, credentials: Optional[HTTPAuthorizationCredentials]) -> dict:
     if travel_id not in travel_summaries_store:
         return {"error": "여행 ID 없음", "success": False}
     
     travel_plan = travel_summaries_store[travel_id]
     
     # TripPlanResponse로 변환 (camelCase로 자동 변환됨)
-    plan_response = TripPlanResponse(
-        title=travel_plan.title,
-        destination=travel_plan.destination,
-        departure=travel_plan.departure,
-        startDate=travel_plan.startDate,
-        endDate=travel_plan.endDate,
-        companions=travel_plan.companions,
-        budget=travel_plan.budget,
-        travelStyles=travel_plan.travelStyles,
-        highlights=travel_plan.highlights,
-        dailySchedules=travel_plan.dailySchedules,
-        outboundTransportation=travel_plan.outboundTransportation,
-        returnTransportation=travel_plan.returnTransportation,
-        accommodations=travel_plan.accommodations
-    )
+    plan_response = to_plan_response(travel_plan)
     
     # JSON으로 변환 (camelCase 형식)
     plan_data = plan_response.model_dump(by_alias=True)
@@ -903,8 +2756,9 @@ async def save_plan(
     print(json.dumps(plan_data, indent=2, ensure_ascii=False))
     print("=" * 80)
     
+    spring_breaker.before_call()  # Spring Boot 장애로 서킷이 열려 있으면 즉시 503
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=SPRING_TIMEOUT) as client:
             headers = {"Content-Type": "application/json"}
             if credentials:
                 # HTTPBearer를 사용하면 자동으로 "Bearer {token}" 형식
@@ -923,6 +2777,12 @@ async def save_plan(
                 headers=headers
             )
             
+            # 5xx만 Spring Boot 장애로 집계 (4xx는 요청 문제)
+            if response.status_code >= 500:
+                spring_breaker.record_failure(f"HTTP {response.status_code}")
+            else:
+                spring_breaker.record_success()
+            
             # DEBUG: Spring Boot 응답 상태 출력
             print("=" * 80)
             print(f"[DEBUG] Spring Boot 응답 상태: {response.status_code}")
@@ -944,12 +2804,14 @@ async def save_plan(
                     "error": f"Spring Boot 서버 응답 오류: {response.status_code}",
                     "detail": response.text
                 }
-    except httpx.TimeoutException:
+    except httpx.TimeoutException as e:
+        spring_breaker.record_failure(e)
         return {
             "success": False,
             "error": "Spring Boot 서버 연결 시간 초과"
         }
     except httpx.RequestError as e:
+        spring_breaker.record_failure(e)
         return {
             "success": False,
             "error": f"Spring Boot 서버 연결 실패: {str(e)}"
@@ -960,3 +2822,140 @@ async def save_plan(
             "error": f"예상치 못한 오류 발생: {str(e)}"
         }
 
+
+EXPORT_CHUNK_SIZE = 64 * 1024  # 내보내기 스트림 청크 크기 (바이트)
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))  # 가져오기 시 한 번에 저장소에 반영할 레코드 수
+IMPORT_MAX_LINE_BYTES = 10 * 1024 * 1024  # 한 줄(레코드) 최대 크기
+IMPORT_MAX_ERRORS = 20  # 응답에 포함할 오류 예시 수
+IMPORT_DECOMPRESS_CHUNK = 256 * 1024  # gzip 압축 해제 시 한 번에 풀어내는 최대 크기 (바이트)
+
+
+def export_record(travel_id: str, plan: TripPlan) -> bytes:
+    """여행 하나를 NDJSON 한 줄로 직렬화 (full_plan 텍스트 포함, LRU 캐시는 건드리지 않음)"""
+    record = plan.model_dump(exclude={"fullPlanDigest"})
+    if plan.fullPlanDigest:
+        record["fullPlan"] = plan_blob_store.get(plan.fullPlanDigest, cache=False) or ""
+    record["id"] = travel_id
+    return orjson.dumps(record) + b"\n"
+
+
+async def iter_export(compress: bool):
+    """저장소를 한 건씩 직렬화하며 청크 단위로 내보냄 (ID 목록만 미리 복사)"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits=31: gzip 형식
+    buffer = bytearray()
+    for travel_id in list(travel_summaries_store):
+        plan = travel_summaries_store.get(travel_id)
+        if plan is None:
+            continue  # 내보내는 도중 삭제된 여행
+        buffer += export_record(travel_id, plan)
+        if len(buffer) >= EXPORT_CHUNK_SIZE:
+            chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+            if chunk:
+                yield chunk
+            await asyncio.sleep(0)  # 대량 내보내기 중에도 다른 요청 처리
+    tail = bytes(buffer)
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
+
+
+@app.get("/admin/export", dependencies=ADMIN_DEPENDENCIES)
+async def export_travels(compress: Literal["none", "gzip"] = "none"):
+    """저장된 여행 전체를 NDJSON(선택적으로 gzip)으로 스트리밍 내보내기합니다."""
+    gzip_enabled = compress == "gzip"
+    filename = "travel_export.ndjson.gz" if gzip_enabled else "travel_export.ndjson"
+    return StreamingResponse(
+        iter_export(gzip_enabled),
+        media_type="application/gzip" if gzip_enabled else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def iter_import_chunks(request: Request):
+    """요청 본문 청크를 스트리밍으로 반환 (gzip이면 IMPORT_DECOMPRESS_CHUNK 단위로 점진적 압축 해제)
+
+    압축 해제 출력 크기를 제한해 작은 gzip 폭탄도 메모리에 한 번에 풀리지 않게 한다.
+    """
+    decompressor = None
+    first = True
+    async for chunk in request.stream():
+        if first and chunk:
+            first = False
+            if chunk[:2] == b"\x1f\x8b" or request.headers.get("content-encoding") == "gzip":
+                decompressor = zlib.decompressobj(47)  # wbits=47: gzip/zlib 헤더 자동 감지
+        if decompressor is None:
+            yield chunk
+            continue
+        while True:
+            output = decompressor.decompress(chunk, IMPORT_DECOMPRESS_CHUNK)
+            chunk = decompressor.unconsumed_tail
+            yield output
+            if not chunk and len(output) < IMPORT_DECOMPRESS_CHUNK:
+                break
+    if decompressor is not None:
+        yield decompressor.flush(IMPORT_DECOMPRESS_CHUNK)
+
+
+async def iter_import_lines(request: Request):
+    """요청 본문을 스트리밍으로 읽어 한 줄씩 반환"""
+    buffer = b""
+    async for chunk in iter_import_chunks(request):
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            raise ValueError(f"한 줄이 {IMPORT_MAX_LINE_BYTES} 바이트를 초과합니다.")
+    for line in buffer.split(b"\n"):
+        yield line
+
+
+@app.post("/admin/import", dependencies=ADMIN_DEPENDENCIES)
+async def import_travels(request: Request, mode: Literal["upsert", "skip_existing"] = "upsert"):
+    """NDJSON(또는 gzip NDJSON) 본문을 스트리밍으로 검증하며 배치 단위로 저장소에 반영합니다.
+
+    각 줄은 /admin/export 레코드 형식(id + TripPlan 필드)이며, id가 없으면 새로 발급합니다.
+    저장 파일은 모든 배치를 반영한 뒤 한 번만 기록됩니다.
+    """
+    result = {"imported": 0, "skipped": 0, "failed": 0, "errors": []}
+    batch: List[Tuple[str, TripPlan]] = []
+
+    def flush_batch() -> None:
+        for travel_id, plan in batch:
+            put_travel_plan(travel_id, plan)
+        result["imported"] += len(batch)
+        batch.clear()
+
+    line_number = 0
+    try:
+        async for line in iter_import_lines(request):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+                travel_id = str(record.pop("id", None) or uuid.uuid4())
+                # 블롭 키는 서버가 fullPlan에서 계산 - 클라이언트 값은 경로 조작/없는 블롭 참조에 쓰일 수 있음
+                record.pop("fullPlanDigest", None)
+                record.pop("full_plan_digest", None)
+                if mode == "skip_existing" and travel_id in travel_summaries_store:
+                    result["skipped"] += 1
+                    continue
+                batch.append((travel_id, TripPlan(**record)))
+            except Exception as e:
+                result["failed"] += 1
+                if len(result["errors"]) < IMPORT_MAX_ERRORS:
+                    result["errors"].append({"line": line_number, "error": str(e)[:300]})
+                continue
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                flush_batch()
+                await asyncio.sleep(0)
+    except (ValueError, zlib.error) as e:
+        result["errors"].append({"line": line_number, "error": f"가져오기 중단: {e}"})
+    finally:
+        flush_batch()
+        if result["imported"]:
+            save_travel_summaries()
+    return result
@@ -0,0 +1,50 @@
+"""import → 첫 요청 응답까지의 콜드 스타트 시간 벤치마크
+
+매 측정마다 새 파이썬 프로세스에서 AI_Chat을 import하고, lifespan 기동 후
+/travel-summaries 첫 요청이 끝날 때까지의 시간을 잰다.
+
+실행: python benchmarks/bench_cold_start.py [--app-dir 경로] [--runs 5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+CHILD = """
+import sys, time, json
+from fastapi.testclient import TestClient  # 측정 대상이 아닌 테스트 클라이언트는 미리 import
+sys.path.insert(0, {app_dir!r})
+t0 = time.perf_counter()
+import AI_Chat
+t1 = time.perf_counter()
+with TestClient(AI_Chat.app) as client:
+    t2 = time.perf_counter()
+    client.get("/travel-summaries")
+    t3 = time.perf_counter()
+print(json.dumps({{"import": t1 - t0, "startup": t2 - t1, "first_request": t3 - t2, "total": t3 - t0}}))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app-dir", default=str(Path(__file__).resolve().parent.parent))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for _ in range(args.runs):
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD.format(app_dir=args.app_dir)],
+            capture_output=True, text=True, check=True, cwd=args.app_dir,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{args.app_dir} ({args.runs}회 중앙값)")
+    for key in ("import", "startup", "first_request", "total"):
+        print(f"  {key:<14} {statistics.median(r[key] for r in results) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
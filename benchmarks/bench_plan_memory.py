@@ -0,0 +1,97 @@
+"""여행 10,000건 기준 상주 메모리 벤치마크
+
+full_plan 텍스트를 TripPlan 안에 그대로 두는 방식(기존)과
+put_travel_plan으로 블롭 저장소에 분리하는 방식의 메모리 사용량을 tracemalloc으로 비교한다.
+
+실행: python benchmarks/bench_plan_memory.py
+"""
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import AI_Chat
+from AI_Chat import PlanBlobStore, TripPlan, put_travel_plan
+
+TRIPS = 10_000
+
+PLAN_TEMPLATE = """- 제목: {destination} 2박 3일 힐링 여행 #{index}
+- 여행지: {destination}
+- 기간: 2025.12.13 ~ 2025.12.15
+- 하이라이트:
+  • 성산일출봉 일출 감상
+  • 한라산 트레킹
+  • 오션뷰 카페 투어
+
+---
+""" + """
+📅 {day}일차
+- 이동수단: 비행기 "김포공항 → 제주공항" (대한항공 KE1234편, 09:00 출발 → 10:05 도착, 편도 65,000원)
+- 오전: 제주공항 도착 → 렌터카 픽업 (롯데렌터카, 1일 60,000원) → 숙소 짐 보관
+- 카페: "앤트러사이트 제주" (대표 메뉴: 콜드브루, 영업시간 09:00~19:00, 월요일 휴무, 제주시 한림읍)
+- 점심: "연돈볼카츠" (대표 메뉴: 돈카츠, 영업시간 11:00~20:00, 서귀포시 색달동)
+- 오후: 성산일출봉 등반 및 오션뷰 감상, 섭지코지 산책
+- 저녁: 해안도로 드라이브 & 흑돼지 거리 "돈사돈" (영업시간 12:00~22:00)
+- 숙소: "제주신라호텔" (1박 약 250,000원)
+
+```json
+{{"day": {day}, "schedules": [{{"time": "09:00", "title": "김포공항 출발", "description": "비행기 탑승"}}]}}
+```
+""" * 3
+
+
+def make_plan(index: int) -> TripPlan:
+    text = PLAN_TEMPLATE.format(destination="제주도", index=index, day=1)
+    return TripPlan(
+        title=f"제주도 2박 3일 힐링 여행 #{index}",
+        destination="제주도",
+        departure="서울",
+        start_date="2025-12-13",
+        end_date="2025-12-15",
+        companions="친구",
+        budget="70만원",
+        travel_styles=["자연과 함께"],
+        full_plan=text,
+    )
+
+
+def measure(store_fn) -> int:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    store = store_fn()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del store
+    return used
+
+
+def build_inline() -> dict:
+    return {str(i): make_plan(i) for i in range(TRIPS)}
+
+
+def build_blob() -> dict:
+    AI_Chat.travel_summaries_store.clear()
+    for i in range(TRIPS):
+        put_travel_plan(str(i), make_plan(i))
+    return AI_Chat.travel_summaries_store
+
+
+def main() -> None:
+    inline = measure(build_inline)
+    with tempfile.TemporaryDirectory() as tmp:
+        AI_Chat.plan_blob_store = PlanBlobStore(Path(tmp), AI_Chat.PLAN_CACHE_SIZE)
+        blob = measure(build_blob)
+        disk = sum(p.stat().st_size for p in Path(tmp).glob("*/*.zz"))
+    print(f"여행 {TRIPS:,}건, full_plan 평균 {len(make_plan(0).fullPlan):,}자")
+    print(f"  inline full_plan    {inline / 2**20:8.1f} MiB")
+    print(f"  blob store + LRU    {blob / 2**20:8.1f} MiB (LRU {AI_Chat.PLAN_CACHE_SIZE}건)")
+    print(f"  디스크 (zlib)        {disk / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
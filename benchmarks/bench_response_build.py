@@ -0,0 +1,111 @@
+"""TripPlan → 응답 생성 시간 벤치마크
+
+기존 방식(TripPlanResponse 수동 생성 + FastAPI jsonable_encoder + JSONResponse)과
+to_plan_response + FastJSONResponse 방식의 응답 바이트 생성 시간을 비교한다.
+
+실행: python benchmarks/bench_response_build.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from AI_Chat import (
+    DailySchedule,
+    FastJSONResponse,
+    ScheduleItem,
+    TravelStyle,
+    TripAccommodation,
+    TripHighlight,
+    TripPlan,
+    TripPlanResponse,
+    TripTransportation,
+    to_plan_response,
+)
+
+
+def make_plan(days: int) -> TripPlan:
+    return TripPlan(
+        title=f"제주도 {days - 1}박 {days}일 힐링 여행",
+        destination="제주도",
+        departure="서울",
+        start_date="2025-12-13",
+        end_date="2025-12-26",
+        companions="친구",
+        budget="100만원",
+        travel_styles=[TravelStyle.NATURE, TravelStyle.HEALING],
+        highlights=[TripHighlight(content=f"하이라이트 {i}") for i in range(5)],
+        full_plan="📅 1일차\n- 오전: 성산일출봉 등반\n" * 50,
+        daily_schedules=[
+            DailySchedule(
+                day=d,
+                date=f"2025-12-{13 + d - 1:02d}",
+                schedules=[
+                    ScheduleItem(order_index=i, time=f"{8 + i:02d}:00", title=f"제주 명소 {i}", description="해변 산책")
+                    for i in range(1, 9)
+                ],
+            )
+            for d in range(1, days + 1)
+        ],
+        outbound_transportation=TripTransportation(origin="김포공항", destination="제주공항", name="대한항공KE1234", price=65000),
+        return_transportation=TripTransportation(origin="제주공항", destination="김포공항", name="아시아나OZ8954", price=68000),
+        accommodations=[TripAccommodation(name="제주신라호텔", address="서귀포시 중문관광로72번길 75", pricePerNight=250000)],
+    )
+
+
+def legacy_response(plan: TripPlan) -> TripPlanResponse:
+    return TripPlanResponse(
+        title=plan.title,
+        destination=plan.destination,
+        departure=plan.departure,
+        startDate=plan.startDate,
+        endDate=plan.endDate,
+        companions=plan.companions,
+        budget=plan.budget,
+        travelStyles=plan.travelStyles,
+        highlights=plan.highlights,
+        dailySchedules=plan.dailySchedules,
+        outboundTransportation=plan.outboundTransportation,
+        returnTransportation=plan.returnTransportation,
+        accommodations=plan.accommodations,
+    )
+
+
+def bench(label: str, fn, repeat: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<10} {elapsed * 1000:9.3f} ms")
+    return elapsed
+
+
+def main() -> None:
+    plan = make_plan(14)
+    print("14일 일정 단건 응답 (/travel-summary/{travel_id})")
+    old = bench("legacy", lambda: JSONResponse(jsonable_encoder(legacy_response(plan))).body, 2000)
+    new = bench("fast", lambda: FastJSONResponse(to_plan_response(plan)).body, 2000)
+    print(f"  speedup    {old / new:9.1f}x")
+
+    plans = [make_plan(3) for _ in range(10_000)]
+    print("요약 10,000건 목록 응답 (/travel-summaries)")
+    old = bench(
+        "legacy",
+        lambda: JSONResponse(jsonable_encoder({"summaries": [legacy_response(p) for p in plans], "total": len(plans)})).body,
+        3,
+    )
+    new = bench(
+        "fast",
+        lambda: FastJSONResponse({"summaries": [to_plan_response(p) for p in plans], "total": len(plans)}).body,
+        3,
+    )
+    print(f"  speedup    {old / new:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,10 @@ from fastapi import FastAPI
 from pydantic import BaseModel
 import google.generativeai as genai
 from dotenv import load_dotenv
+from collections import OrderedDict
 import os
+import time
+import uuid
 
 # 🔹 환경 변수 로드
 load_dotenv()
@@ -44,24 +47,127 @@ async def create_travel_plan(data: TravelInput):
 
 
 # 🔹 2️⃣ 피드백(대화형 수정) 기능 추가
-chat_history = []  # 대화 저장용 리스트 (간단 테스트용)
+# 대화별로 최근 메시지만 그대로 보내고, 오래된 대화는 요약본으로 압축해 보낸다.
+CHAT_HISTORY_WINDOW = int(os.getenv("CHAT_HISTORY_WINDOW", "10"))  # 그대로 전달하는 최대 메시지 수
+CHAT_SUMMARY_TOKEN_THRESHOLD = int(os.getenv("CHAT_SUMMARY_TOKEN_THRESHOLD", "8000"))  # 최근 메시지가 이 토큰 수를 넘으면 오래된 대화 요약
+CHAT_SUMMARY_TARGET_TOKENS = int(os.getenv("CHAT_SUMMARY_TARGET_TOKENS", str(CHAT_SUMMARY_TOKEN_THRESHOLD // 2)))  # 요약 후 남길 최근 메시지 토큰 수
+CHAT_IDLE_TTL_SECONDS = int(os.getenv("CHAT_IDLE_TTL_SECONDS", "1800"))  # 이 시간 동안 요청이 없으면 대화 삭제
+CHAT_MAX_CONVERSATIONS = int(os.getenv("CHAT_MAX_CONVERSATIONS", "1000"))  # 동시에 보관하는 최대 대화 수
+
+
+class Conversation:
+    """대화 하나의 상태 (오래된 대화 요약 + 최근 메시지)"""
+
+    def __init__(self):
+        self.summary = ""
+        self.messages: list[dict] = []  # {"role": "user" | "model", "content": str}
+        self.last_active = time.time()
+
+
+conversations: "OrderedDict[str, Conversation]" = OrderedDict()  # 최근 사용 순서로 유지
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사치 (한국어 기준 약 2자당 1토큰)"""
+    return len(text) // 2 + 1
+
+
+def evict_idle_conversations(now: float) -> None:
+    """오래 사용하지 않은 대화와 최대 개수를 넘는 대화 삭제 (가장 오래된 것부터)"""
+    while conversations:
+        oldest_id, oldest = next(iter(conversations.items()))
+        if now - oldest.last_active < CHAT_IDLE_TTL_SECONDS and len(conversations) <= CHAT_MAX_CONVERSATIONS:
+            break
+        del conversations[oldest_id]
+
+
+def get_conversation(conversation_id: str) -> Conversation:
+    """대화 조회 (없으면 새로 생성)"""
+    now = time.time()
+    evict_idle_conversations(now)
+    conversation = conversations.get(conversation_id)
+    if conversation is None:
+        conversation = conversations[conversation_id] = Conversation()
+    conversations.move_to_end(conversation_id)
+    conversation.last_active = now
+    return conversation
+
+
+def compaction_start(messages: list[dict]) -> int:
+    """남길 최근 메시지의 시작 위치
+
+    요약이 매 요청마다 일어나지 않도록 창의 절반, CHAT_SUMMARY_TARGET_TOKENS 이하만 남겨
+    요약 직후에는 기준보다 충분히 낮게 만든다. 남기는 메시지는 user 메시지로 시작해야
+    요약 확인(model) 다음에 user/model 순서가 유지된다. 최신 메시지는 항상 남긴다.
+    """
+    max_keep = max(CHAT_HISTORY_WINDOW // 2, 1)
+    start = len(messages) - 1
+    kept_tokens = estimate_tokens(messages[start]["content"])
+    while start > 0 and len(messages) - start < max_keep:
+        tokens = estimate_tokens(messages[start - 1]["content"])
+        if kept_tokens + tokens > CHAT_SUMMARY_TARGET_TOKENS:
+            break
+        kept_tokens += tokens
+        start -= 1
+    while start < len(messages) - 1 and messages[start]["role"] != "user":
+        start += 1
+    return start
+
+
+async def compact_conversation(model, conversation: Conversation) -> None:
+    """최근 메시지 수나 토큰 수가 기준을 넘으면 오래된 메시지를 요약본에 합침"""
+    tokens = sum(estimate_tokens(m["content"]) for m in conversation.messages)
+    if len(conversation.messages) <= CHAT_HISTORY_WINDOW and tokens <= CHAT_SUMMARY_TOKEN_THRESHOLD:
+        return
+
+    start = compaction_start(conversation.messages)
+    old_messages, recent_messages = conversation.messages[:start], conversation.messages[start:]
+    if not old_messages:
+        return
+
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in old_messages)
+    prompt = f"""
+    아래는 여행 일정 수정 대화의 이전 요약과 이어지는 대화입니다.
+    사용자의 요청 사항, 제약 조건, 확정된 일정 변경 내용을 빠짐없이 간결하게 요약해줘.
+
+    [이전 요약]
+    {conversation.summary or "없음"}
+
+    [대화]
+    {transcript}
+    """
+    try:
+        conversation.summary = (await model.generate_content_async(prompt)).text
+    except Exception as e:
+        # 요약에 실패해도 메모리가 계속 늘지 않도록 오래된 메시지는 버림
+        print(f"대화 요약 실패: {e}")
+    conversation.messages = recent_messages
+
 
 @app.post("/feedback")
 async def feedback(user_message: dict):
     """
     사용자의 피드백 메시지를 받아서 AI가 기존 대화 내용을 기반으로 수정/답변함.
+    conversation_id를 함께 보내면 같은 대화를 이어가고, 없으면 새 대화를 시작함.
     """
     message = user_message.get("message", "")
-    chat_history.append({"role": "user", "content": message})
+    conversation_id = user_message.get("conversation_id") or str(uuid.uuid4())
+    conversation = get_conversation(conversation_id)
+    conversation.messages.append({"role": "user", "content": message})
 
     model = genai.GenerativeModel("gemini-1.5-flash")
+    await compact_conversation(model, conversation)
+
+    # 오래된 대화 요약 + 최근 대화만 포함해서 전달
+    contents = []
+    if conversation.summary:
+        contents.append({"role": "user", "parts": [f"이전 대화 요약:\n{conversation.summary}"]})
+        contents.append({"role": "model", "parts": ["네, 이전 대화 내용을 참고하겠습니다."]})
+    contents.extend({"role": m["role"], "parts": [m["content"]]} for m in conversation.messages)
 
-    # 이전 대화 내용 포함해서 전달
-    response = model.generate_content(
-        contents=[{"role": m["role"], "parts": [m["content"]]} for m in chat_history]
-    )
+    response = await model.generate_content_async(contents)
 
     reply = response.text
-    chat_history.append({"role": "model", "content": reply})
+    conversation.messages.append({"role": "model", "content": reply})
 
-    return {"reply": reply}
\ No newline at end of file
+    return {"reply": reply, "conversation_id": conversation_id}
@@ -0,0 +1,120 @@
+"""생성 계획 JSON 블록의 로컬 복구 테스트 (모델 재요청 없이 복구되어야 하는 경우)"""
+import asyncio
+import json
+
+import pytest
+
+import AI_Chat
+
+TRANSPORT_QUOTED_PRICE = (
+    '[{"origin": "김포공항", "destination": "제주공항", "name": "대한항공KE1234", "price": "65,000원"},'
+    ' {"origin": "제주공항", "destination": "김포공항", "name": "아시아나OZ8954", "price": "6.8만원"}]'
+)
+
+
+@pytest.fixture
+def no_model(monkeypatch):
+    """모델 재요청이 일어나면 실패"""
+
+    async def fail(prompt):
+        raise AssertionError("로컬 복구 가능한 블록에 모델 재요청 발생")
+
+    monkeypatch.setattr(AI_Chat, "generate_content", fail)
+
+
+def test_quoted_price_is_fixed_locally():
+    data, fixes, error = AI_Chat.check_plan_block("transportation", TRANSPORT_QUOTED_PRICE)
+
+    assert error is None
+    assert fixes == ["price"]
+    assert [leg["price"] for leg in data] == [65000, 68000]
+
+
+def test_quoted_price_block_repaired_without_model(no_model):
+    plan = f"📅 1일차\n```transportation\n{TRANSPORT_QUOTED_PRICE}\n```\n"
+
+    repaired = asyncio.run(AI_Chat.repair_plan_blocks(plan))
+    outbound, inbound = AI_Chat.extract_transportations_from_plan(repaired)
+
+    assert (outbound.price, inbound.price) == (65000, 68000)
+    assert json.loads(AI_Chat.iter_plan_blocks(repaired, "transportation")[0])[0]["price"] == 65000
+
+
+def test_extractor_accepts_quoted_price_without_repair_stage():
+    plan = f"```transportation\n{TRANSPORT_QUOTED_PRICE}\n```"
+
+    outbound, inbound = AI_Chat.extract_transportations_from_plan(plan)
+
+    assert (outbound.price, inbound.price) == (65000, 68000)
+
+
+@pytest.mark.parametrize(
+    "text, fix",
+    [
+        ('{"day": 1, "schedules": [{"time": "09:00", "title": "출발", "description": "탑승"},]}', "trailing_comma"),
+        ('{"day": 1, "schedules": [{"time": "09:00", "title": "출발", "description": "탑승"}, {"time": "10', "truncated"),
+    ],
+)
+def test_syntax_fixes(text, fix):
+    data, fixes, error = AI_Chat.check_plan_block("json", text)
+
+    assert error is None
+    assert fix in fixes
+    assert data["schedules"][0]["title"] == "출발"
+
+
+def test_unfixable_price_is_reported():
+    data, _, error = AI_Chat.check_plan_block(
+        "accommodations", '[{"name": "호텔", "address": "제주시", "pricePerNight": "문의"}]'
+    )
+
+    assert data is None
+    assert error.startswith("형식 오류")
+
+
+TRANSPORT_MISSING_COMMA = (
+    '[{"origin": "김포공항", "destination": "제주공항", "name": "대한항공KE1234", "price": 65000},\n'
+    ' {"origin": "제주공항" "destination": "김포공항", "name": "아시아나OZ8954", "price": 68000}]'
+)
+TRANSPORT_FIXED = TRANSPORT_MISSING_COMMA.replace('"제주공항" "destination"', '"제주공항", "destination"')
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+def test_complete_block_broken_midway_is_not_truncated():
+    data, fixes, error = AI_Chat.check_plan_block("transportation", TRANSPORT_MISSING_COMMA)
+
+    assert data is None
+    assert "truncated" not in fixes
+    assert error == "JSON 파싱 실패"
+
+
+def test_complete_block_broken_midway_goes_to_model(monkeypatch):
+    prompts = []
+
+    async def model(prompt):
+        prompts.append(prompt)
+        return FakeResponse(TRANSPORT_FIXED)
+
+    monkeypatch.setattr(AI_Chat, "generate_content", model)
+    plan = f"```transportation\n{TRANSPORT_MISSING_COMMA}\n```\n\n📅 1일차\n"
+
+    repaired = asyncio.run(AI_Chat.repair_plan_blocks(plan))
+    outbound, inbound = AI_Chat.extract_transportations_from_plan(repaired)
+
+    assert len(prompts) == 1
+    assert (outbound.name, inbound.name) == ("대한항공KE1234", "아시아나OZ8954")
+
+
+def test_unclosed_fence_is_truncation_repaired(no_model):
+    plan = f"```transportation\n{TRANSPORT_FIXED[:-40]}"
+
+    repaired = asyncio.run(AI_Chat.repair_plan_blocks(plan))
+    outbound, inbound = AI_Chat.extract_transportations_from_plan(repaired)
+
+    assert outbound.name == "대한항공KE1234" and inbound is None
+    assert repaired.endswith("\n```")